@@ -1,6 +1,5 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import requests
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
@@ -8,31 +7,99 @@ import os
 import re
 import random
 import io
+import csv
 import time
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from deep_translator import GoogleTranslator
 
 # --- NEW: AUDIO & NLP LIBRARIES ---
-from gtts import gTTS
-import nltk
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
+from audio import get_audio_bytes
+import nlp
+from nlp import get_nltk_root
+
+from storage import make_backend
+from store import VocabStore
+from score_queue import ScoreQueue
+from sheets_client import QuotaAwareWorksheet, TokenBucket
+from mw_cache import LookupCache
+from mw_quota import DailyQuota
+from hedge import Hedger
+from lookup import LookupEngine
+from offline_dict import OfflineDictionary
+from spell import SpellSuggester
+from lookup import SPELLER_SOURCE
+from entry import Entry, Suggestions
+from offline_dict import FILE_NAME as OFFLINE_DICT_FILE
+from synonym_index import SynonymIndex, FILE_NAME as SYNONYM_INDEX_FILE
+from prefetch import Prefetcher
+import metrics
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Vocab Tracker", page_icon="📖", layout="centered")
 
-# --- NLTK SETUP (Run once) ---
-try:
-    nltk.data.find('corpora/wordnet.zip')
-except LookupError:
-    nltk.download('wordnet')
-    nltk.download('omw-1.4')
-
-lemmatizer = WordNetLemmatizer()
+def get_setting(name, default=None):
+    """Read a setting from the VOCAB_<NAME> env var, then st.secrets."""
+    value = os.environ.get(f"VOCAB_{name.upper()}")
+    if value is not None:
+        return value
+    try:
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+# "sheets" (Google Sheets, default) or "sqlite" (local file)
+STORAGE_BACKEND = get_setting("storage_backend", "sheets")
+# The shared snapshot checks the backend's version this often (seconds) and
+# reloads only when it changed; SNAPSHOT_TTL caps its age regardless
+SNAPSHOT_PROBE_INTERVAL = 15
+SNAPSHOT_TTL = 1800
+# Local state that must survive restarts (score journal, caches)
+CACHE_DIR = os.environ.get("VOCAB_CACHE_DIR", ".vocab_cache")
+os.makedirs(CACHE_DIR, exist_ok=True)
+SQLITE_PATH = get_setting("sqlite_path", os.path.join(CACHE_DIR, "vocab.sqlite3"))
+# Graded cards are written to the sheet in batches of this size, or after
+# this many seconds, whichever comes first
+SCORE_FLUSH_EVERY = 5
+SCORE_FLUSH_INTERVAL = 30
+# Google Sheets per-minute request quotas shared by all sessions
+SHEETS_READS_PER_MINUTE = 60
+SHEETS_WRITES_PER_MINUTE = 60
+# Parsed dictionary lookups kept on disk; "not found" results expire sooner
+MW_CACHE_MAX_ENTRIES = 5000
+MW_CACHE_TTL = 30 * 86400
+MW_CACHE_NEGATIVE_TTL = 86400
+# Merriam-Webster requests allowed per UTC day; below MW_QUOTA_RESERVE left,
+# optional requests (root validation, prefetch) stop and words are served
+# from the cache or the offline dictionary where possible
+MW_DAILY_LIMIT = int(get_setting("mw_daily_limit", 1000))
+MW_QUOTA_RESERVE = int(get_setting("mw_quota_reserve", 200))
+# A dictionary request still unanswered after this percentile of recent
+# latencies gets an identical backup request; 0 turns hedging off
+MW_HEDGE_PERCENTILE = float(get_setting("mw_hedge_percentile", 95))
+# Parallel dictionary lookups during a bulk import
+IMPORT_WORKERS = 8
+# Words warmed in the background after each search, and the cap on such
+# speculative lookups per 24 hours
+PREFETCH_PER_PAGE = 4
+PREFETCH_DAILY_BUDGET = 100
+# Serve definitions from the offline WordNet dictionary first and call
+# Merriam-Webster only for words it lacks (it is always used as a fallback)
+DICTIONARY_FAST_MODE = str(get_setting("fast_mode", "false")).lower() in ("1", "true", "yes")
+# Threads shared by the independent stages of a single search
+LOOKUP_STAGE_WORKERS = 8
 
 # --- SESSION STATE INITIALIZATION ---
 if 'active_search' not in st.session_state:
     st.session_state.active_search = ""
+# Word the user asked to look up despite a local "Did you mean"
+if 'skip_spelling_for' not in st.session_state:
+    st.session_state.skip_spelling_for = ""
+# ((word, check_spelling), Entry or Suggestions, headword audio bytes) of
+# the last result shown, reused as-is by reruns of the same search
+if 'shown_result' not in st.session_state:
+    st.session_state.shown_result = None
 
 # Flashcard States
 if 'flashcards' not in st.session_state:
@@ -85,6 +152,16 @@ def log_performance(action_name):
         if len(st.session_state.logs) > 20:
             st.session_state.logs.pop()
 
+# --- NLP WARM-UP ---
+# WordNet loads in a background thread once per server process; searches
+# made before it is ready come back without roots and synonyms
+@st.cache_resource
+def start_wordnet_warmup():
+    nlp.warmup.start()
+    return nlp.warmup
+
+start_wordnet_warmup()
+
 # --- 1. CONNECT TO GOOGLE SHEETS ---
 @st.cache_resource
 def get_sheet():
@@ -97,143 +174,175 @@ def get_sheet():
         creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
         
     client = gspread.authorize(creds)
-    return client.open("VocabApp_DB").sheet1
+    return QuotaAwareWorksheet(
+        client.open("VocabApp_DB").sheet1,
+        read_bucket=TokenBucket(SHEETS_READS_PER_MINUTE),
+        write_bucket=TokenBucket(SHEETS_WRITES_PER_MINUTE),
+    )
 
-# --- 2. LOGIC HELPERS ---
+@st.cache_resource
+def get_backend():
+    return make_backend(STORAGE_BACKEND, get_sheet=get_sheet, sqlite_path=SQLITE_PATH)
+
+# Shared by every session on this server; reads never touch the backend
+# until the snapshot expires.
+@st.cache_resource
+def get_store():
+    store = VocabStore(
+        get_backend(), ttl=SNAPSHOT_TTL, root_fn=get_nltk_root,
+        probe_interval=SNAPSHOT_PROBE_INTERVAL,
+    )
+    # Lemma duplicates can only be indexed once WordNet is loaded
+    nlp.warmup.on_ready(store.reindex)
+    return store
+
+@st.cache_resource
+def get_score_queue():
+    return ScoreQueue(
+        get_store(), os.path.join(CACHE_DIR, "score_journal.json"),
+        flush_every=SCORE_FLUSH_EVERY, flush_interval=SCORE_FLUSH_INTERVAL,
+    )
+
+@st.cache_resource
+def get_lookup_cache():
+    return LookupCache(
+        os.path.join(CACHE_DIR, "mw_cache.sqlite3"), max_entries=MW_CACHE_MAX_ENTRIES,
+        ttl=MW_CACHE_TTL, negative_ttl=MW_CACHE_NEGATIVE_TTL,
+    )
+
+@st.cache_resource
+def get_mw_quota():
+    return DailyQuota(
+        os.path.join(CACHE_DIR, "mw_quota.sqlite3"),
+        daily_limit=MW_DAILY_LIMIT, reserve=MW_QUOTA_RESERVE,
+    )
 
-# --- AUDIO GENERATOR (gTTS) ---
-def get_audio_bytes(text, lang='en'):
+@st.cache_resource
+def get_stage_pool():
+    return ThreadPoolExecutor(max_workers=LOOKUP_STAGE_WORKERS, thread_name_prefix="lookup-stage")
+
+@st.cache_resource
+def get_offline_dictionary():
+    # Synonym lists are read from the shared index rather than ranked again
+    dictionary = OfflineDictionary(os.path.join(CACHE_DIR, OFFLINE_DICT_FILE), synonyms=get_synonym_index())
+    # Opens the store, or starts compiling it in the background if missing
+    dictionary.ready()
+    return dictionary
+
+@st.cache_resource
+def get_synonym_index():
+    index = SynonymIndex(os.path.join(CACHE_DIR, SYNONYM_INDEX_FILE))
+    # Opens the index, or starts building it in the background if missing
+    index.ready()
+    nlp.use_synonym_index(index)
+    return index
+
+@st.cache_resource
+def get_speller():
+    speller = SpellSuggester()
     try:
-        tts = gTTS(text=text, lang=lang)
-        fp = io.BytesIO()
-        tts.write_to_fp(fp)
-        fp.seek(0)
-        return fp
+        saved_words = [r.get("Word", "") for r in get_store().records()]
     except Exception as e:
-        print(f"Audio generation error: {e}")
-        return None
+        print(f"Speller starting without saved words: {e}")
+        saved_words = []
+    speller.load_async(saved_words)
+    return speller
 
-# --- NLTK ROOT LOGIC ---
-def get_nltk_root(word):
-    w = word.lower().strip()
-    
-    lemma = lemmatizer.lemmatize(w, pos='n')
-    if lemma != w: return lemma
-    
-    lemma = lemmatizer.lemmatize(w, pos='v')
-    if lemma != w: return lemma
-    
-    lemma = lemmatizer.lemmatize(w, pos='a')
-    if lemma != w: return lemma
-    
-    return None
+@st.cache_resource
+def get_lookup_engine():
+    get_synonym_index()
+    return LookupEngine(
+        st.secrets["merriam_key"], cache=get_lookup_cache(), pool=get_stage_pool(),
+        offline=get_offline_dictionary(), fast_mode=DICTIONARY_FAST_MODE,
+        speller=get_speller(), quota=get_mw_quota(),
+        hedger=Hedger("mw", percentile=MW_HEDGE_PERCENTILE) if MW_HEDGE_PERCENTILE > 0 else None,
+    )
 
-# --- NLTK SYNONYM LOGIC ---
-def get_synonyms_nltk(word):
-    synonyms = set()
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher(
+        # The speller's answers are not cached, so it would waste the budget
+        partial(get_lookup_engine().lookup, check_spelling=False), get_lookup_cache(),
+        per_page=PREFETCH_PER_PAGE, daily_budget=PREFETCH_DAILY_BUDGET,
+        quota=get_mw_quota(),
+    )
+
+def prefetch_links(words):
+    """Warm the cache for links on the page; never let speculation break it."""
     try:
-        for syn in wordnet.synsets(word):
-            for lemma in syn.lemmas():
-                clean_syn = lemma.name().replace('_', ' ')
-                if clean_syn.lower() != word.lower():
-                    synonyms.add(clean_syn)
-    except Exception:
-        pass
-    
-    return list(synonyms)[:5]
+        get_prefetcher().schedule(words)
+    except Exception as e:
+        print(f"Prefetch unavailable: {e}")
+
+# --- 2. LOGIC HELPERS ---
 
 def update_score(word, success):
+    # Only updates the snapshot; the sheet write happens in the background
     try:
-        sheet = get_sheet()
-        cell = sheet.find(word) 
-        if cell:
-            current_score = int(sheet.cell(cell.row, 6).value)
+        current_score = get_store().count(word)
+        if current_score is not None:
             new_score = current_score + 1 if success else 1
-            sheet.update_cell(cell.row, 6, new_score)
+            get_score_queue().record(word, new_score)
     except Exception as e:
         print(f"Error updating score: {e}")
 
 # --- 3. GET DATA FROM API ---
-def get_mw_data(query):
+def get_mw_data(query, check_spelling=True):
     try:
-        key = st.secrets["merriam_key"]
+        engine = get_lookup_engine()
     except:
         st.error("Missing API Key! Check secrets.")
         return None
 
-    def validate_word_exists(candidate_word):
-        check_url = f"https://www.dictionaryapi.com/api/v3/references/collegiate/json/{candidate_word}?key={key}"
-        try:
-            r = requests.get(check_url)
-            d = r.json()
-            if not d or isinstance(d[0], str): return False
-            return True
-        except: return False
-
-    url = f"https://www.dictionaryapi.com/api/v3/references/collegiate/json/{query}?key={key}"
-    
     try:
-        response = requests.get(url)
-        data = response.json()
-        
-        if not data: return None
-        if isinstance(data[0], str): return {"suggestion": data}
-
-        combined_defs = []
-        combined_pos = set()
-        root_word_ref = None
-        target_clean = query.lower().strip()
-
-        first_entry_id = data[0].get("meta", {}).get("id", "").split(":")[0]
-        if first_entry_id and first_entry_id.lower() != target_clean:
-            if first_entry_id.lower() not in target_clean: 
-                root_word_ref = first_entry_id.title()
-
-        if not root_word_ref:
-            for entry in data:
-                if isinstance(entry, dict) and "cxs" in entry:
-                    for cx in entry["cxs"]:
-                        for t in cx.get("cxtis", []):
-                            tgt = t.get("cxt", "")
-                            if tgt: root_word_ref = tgt.title()
-
-        if root_word_ref:
-            deeper_root = get_nltk_root(root_word_ref)
-            if deeper_root and validate_word_exists(deeper_root):
-                 root_word_ref = deeper_root.title()
-        else:
-            heuristic_guess = get_nltk_root(target_clean)
-            if heuristic_guess and validate_word_exists(heuristic_guess):
-                root_word_ref = heuristic_guess.title()
-
-        for entry in data:
-            if not isinstance(entry, dict): continue
-            headword_info = entry.get("hwi", {})
-            hw = headword_info.get("hw", "").replace("*", "") 
-            
-            if (" " in hw or "-" in hw) and (hw.lower() != target_clean): continue
-
-            fl = entry.get("fl", "unknown")
-            combined_pos.add(fl)
-            short_defs = entry.get("shortdef", [])
-            if short_defs:
-                def_text = f"({fl}) " + "; ".join([f"{i+1}. {d}" for i, d in enumerate(short_defs)])
-                combined_defs.append(def_text)
-            
-        if not combined_defs and not root_word_ref: return None
-        
-        synonyms = get_synonyms_nltk(query)
-
-        return {
-            "word": query, "pos": ", ".join(combined_pos),
-            "definition": " | ".join(combined_defs),
-            "root_ref": root_word_ref, "synonyms": synonyms
-        }
-
+        return engine.lookup(query, check_spelling=check_spelling)
     except Exception as e:
         st.error(f"API Error: {e}")
         return None
     
+# --- 4. BULK IMPORT ---
+def parse_word_list(text, first_column_only=False):
+    """Words from pasted text or a TXT file (one per line or comma-separated),
+    or from the first column of a CSV file."""
+    words = []
+    for row in csv.reader(io.StringIO(text)):
+        cells = row[:1] if first_column_only else row
+        words.extend(c.strip() for c in cells if c.strip())
+    if words and words[0].lower() == "word":
+        words = words[1:]
+    return words
+
+def import_words(words, on_progress=None):
+    """Look `words` up concurrently and save the found ones in one write.
+
+    Returns (rows saved, failures) where failures are {"Word", "Reason"} dicts.
+    on_progress(done, total) is called from the calling thread.
+    """
+    def report(result, done, total):
+        if on_progress:
+            on_progress(done, total)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    rows, failures = [], []
+    results = get_lookup_engine().lookup_many(words, concurrency=IMPORT_WORKERS, on_result=report)
+    for w, data, error in results:
+        if error:
+            failures.append({"Word": w, "Reason": f"API error: {error}"})
+        elif not data:
+            failures.append({"Word": w, "Reason": "Not found"})
+        elif isinstance(data, Suggestions):
+            hint = ", ".join(data.words[:3])
+            failures.append({"Word": w, "Reason": f"Not found (did you mean {hint}?)"})
+        elif not data.definition_lines():
+            failures.append({"Word": w, "Reason": f"No definition (see {data.root})"})
+        else:
+            rows.append(data.to_row("Imported", timestamp))
+    if rows:
+        get_store().append_rows(rows)
+        for row in rows:
+            get_speller().add_user_word(row[0])
+    return rows, failures
+
 # --- UI LAYOUT ---
 st.title("📚 Vocab Builder")
 
@@ -242,10 +351,8 @@ with st.sidebar:
     st.header("Recent History")
     try:
         with log_performance("Sidebar: Fetch History"):
-            sheet = get_sheet()
-            records = sheet.get_all_records()
-        if records:
-            recent = records[-10:] 
+            recent = get_store().tail(10)
+        if recent:
             recent.reverse() 
             for row in recent:
                 w = row.get("Word") 
@@ -256,7 +363,7 @@ with st.sidebar:
         else:
             st.info("No words saved yet.")
     except Exception as e:
-        st.caption("History unavailable")
+        st.caption(f"History unavailable: {e}")
         
     st.markdown("---")
     
@@ -270,6 +377,21 @@ with st.sidebar:
         else:
             st.caption("No logs recorded yet.")
 
+        st.markdown(f"**WordNet:** {nlp.warmup.status()}")
+        try:
+            quota = get_mw_quota()
+            usage = ", ".join(f"{k} {v}" for k, v in sorted(quota.usage().items()))
+            st.markdown(f"**Merriam-Webster today:** {quota.used()} of {quota.daily_limit} requests"
+                        + (f" ({usage})" if usage else ""))
+            if quota.is_low():
+                st.caption("Saving quota: serving from cache and offline dictionary where possible.")
+        except Exception as e:
+            st.caption(f"Quota unavailable: {e}")
+        counters = metrics.snapshot()
+        if counters:
+            st.markdown("**Counters**")
+            st.dataframe(counters, use_container_width=True)
+
 # --- MAIN TABS ---
 tab1, tab2, tab3 = st.tabs(["📖 Dictionary", "🌍 Translator", "🧠 Practice"])
 
@@ -286,39 +408,64 @@ with tab1:
     if st.session_state.active_search:
         word_to_show = st.session_state.active_search
         
-        with log_performance(f"Dictionary: Fetch API for '{word_to_show}'"):
-            data = get_mw_data(word_to_show)
+        search_key = (word_to_show, st.session_state.skip_spelling_for != word_to_show)
+        audio_future = None
+        if st.session_state.shown_result and st.session_state.shown_result[0] == search_key:
+            _, data, audio_bytes = st.session_state.shown_result
+        else:
+            # Headword audio doesn't depend on the entry; synthesize it meanwhile
+            audio_future = get_stage_pool().submit(get_audio_bytes, word_to_show)
+            with log_performance(f"Dictionary: Fetch API for '{word_to_show}'"):
+                data = get_mw_data(word_to_show, check_spelling=search_key[1])
+            if not isinstance(data, Entry):
+                # Nothing to voice; drop the synthesis unless it already started
+                audio_future.cancel()
+            # Results from while WordNet is loading lack roots and synonyms;
+            # fetch them again on the next rerun rather than keep them
+            if data and nlp.warmup.settled():
+                st.session_state.shown_result = (search_key, data, None)
         
         if data:
-            if "suggestion" in data:
+            if isinstance(data, Suggestions):
                 st.warning("Word not found. Did you mean:")
                 cols = st.columns(3)
-                for i, suggestion in enumerate(data['suggestion'][:9]):
+                for i, suggestion in enumerate(data.words[:9]):
                     with cols[i % 3]:
                         if st.button(suggestion, key=f"sugg_{i}"):
                             st.session_state.active_search = suggestion
                             st.rerun()
+                if data.source == SPELLER_SOURCE:
+                    if st.button(f"🔎 Search the dictionary for '{word_to_show}' anyway"):
+                        st.session_state.skip_spelling_for = word_to_show
+                        st.rerun()
+                else:
+                    prefetch_links(data.words[:9])
             else:
-                if data.get("root_ref"):
-                    st.info(f"Root word found: **{data['root_ref']}**")
-                    if st.button(f"Go to {data['root_ref']}"):
-                        st.session_state.active_search = data['root_ref']
+                if data.root:
+                    st.info(f"Root word found: **{data.root}**")
+                    if st.button(f"Go to {data.root}"):
+                        st.session_state.active_search = data.root
                         st.rerun()
                 else:
                     st.caption("No root word found.")
 
-                st.header(f"📖 {data['word'].title()}")
-                st.markdown(f"**Part of Speech:** *{data['pos']}*")
+                st.header(f"📖 {data.headword.title()}")
+                st.caption(f"Source: {data.source}")
+                st.markdown(f"**Part of Speech:** *{data.pos}*")
                 
-                with log_performance(f"Audio: Generate gTTS for '{data['word']}'"):
-                    audio_bytes = get_audio_bytes(data['word'])
+                if audio_future is not None:
+                    with log_performance(f"Audio: Wait for gTTS for '{word_to_show}'"):
+                        audio = audio_future.result()
+                    audio_bytes = audio.getvalue() if audio else None
+                    if st.session_state.shown_result and st.session_state.shown_result[0] == search_key:
+                        st.session_state.shown_result = (search_key, data, audio_bytes)
                 if audio_bytes:
-                    st.audio(audio_bytes.getvalue(), format='audio/mpeg')
+                    st.audio(audio_bytes, format='audio/mpeg')
 
                 st.markdown("### Synonyms")
-                if data['synonyms']:
+                if data.synonyms:
                     syn_cols = st.columns(3)
-                    for i, syn in enumerate(data['synonyms']):
+                    for i, syn in enumerate(data.synonyms):
                         with syn_cols[i % 3]:
                             if st.button(syn, key=f"syn_{i}"):
                                 st.session_state.active_search = syn
@@ -327,26 +474,71 @@ with tab1:
                     st.caption("No synonyms found.")
 
                 st.markdown("---")
-                display_def = data['definition'].replace("|", "\n\n")
+                display_def = "\n\n".join(data.definition_lines())
                 st.markdown(f"**Definition:**\n\n{display_def}")
                 
                 if st.button("💾 Save Word"):
                     try:
                         with log_performance(f"Database: Save '{word_to_show}'"):
-                            sheet = get_sheet()
-                            existing_words = sheet.col_values(1)
-                            if word_to_show.lower() in [x.lower() for x in existing_words]:
+                            store = get_store()
+                            duplicate = store.find_duplicate(word_to_show)
+                            if duplicate and duplicate.lower() == word_to_show.lower():
                                 st.warning(f"'{word_to_show}' is already in your list!")
+                            elif duplicate:
+                                st.warning(f"'{word_to_show}' is a form of '{duplicate}', which is already in your list!")
                             else:
                                 timestamp = datetime.now().strftime("%Y-%m-%d")
-                                sheet.append_row([
-                                    data['word'].title(), data['definition'], data['pos'], 
-                                    "Auto-Generated", timestamp, 1
-                                ])
-                                st.success(f"Saved '{data['word'].title()}' to your list!")
+                                store.append(data.to_row("Auto-Generated", timestamp))
+                                get_speller().add_user_word(data.headword)
+                                st.success(f"Saved '{data.headword.title()}' to your list!")
                     except Exception as e: st.error(f"Save failed: {e}")
+
+                # Root first: it is the most likely next click
+                prefetch_links(([data.root] if data.root else []) + list(data.synonyms))
         else: st.error("Word not found.")
 
+    st.markdown("---")
+    with st.expander("📥 Import Word List"):
+        with st.form("import_form", clear_on_submit=True):
+            pasted_words = st.text_area("Paste words (one per line or comma-separated):")
+            uploaded_file = st.file_uploader("...or upload a CSV/TXT file", type=["csv", "txt"])
+            import_submitted = st.form_submit_button("Import")
+
+        if import_submitted:
+            words = parse_word_list(pasted_words)
+            if uploaded_file is not None:
+                words += parse_word_list(
+                    uploaded_file.getvalue().decode("utf-8", errors="ignore"),
+                    first_column_only=uploaded_file.name.lower().endswith(".csv"),
+                )
+            try:
+                store = get_store()
+                new_words, already_saved, seen = [], [], set()
+                for w in words:
+                    if w.lower() in seen: continue
+                    seen.add(w.lower())
+                    if store.find_duplicate(w): already_saved.append(w)
+                    else: new_words.append(w)
+
+                if not new_words:
+                    st.info("Nothing new to import.")
+                else:
+                    progress = st.progress(0.0, text=f"Looking up {len(new_words)} words...")
+                    with log_performance(f"Import: {len(new_words)} words"):
+                        saved_rows, failures = import_words(
+                            new_words,
+                            on_progress=lambda done, total: progress.progress(
+                                done / total, text=f"Looked up {done} of {total}"),
+                        )
+                    st.success(f"Imported {len(saved_rows)} word(s).")
+                    if failures:
+                        st.warning(f"{len(failures)} word(s) could not be imported:")
+                        st.dataframe(failures, use_container_width=True)
+                if already_saved:
+                    st.caption(f"Skipped {len(already_saved)} already saved: {', '.join(already_saved)}")
+            except Exception as e:
+                st.error(f"Import failed: {e}")
+
 # --- MODE 2: TRANSLATOR ---
 with tab2:
     st.subheader("🌍 Quick Translate")
@@ -376,6 +568,13 @@ with tab2:
 # --- MODE 3: PRACTICE (FLASHCARDS) ---
 with tab3:
     st.header("🧠 Flashcard Session")
+
+    queue_status = get_score_queue().status()
+    if queue_status["failed"]:
+        st.warning(f"{queue_status['failed']} score update(s) failed to sync and will be retried. "
+                   f"Last error: {queue_status['last_error']}")
+    elif queue_status["pending"]:
+        st.caption(f"⏳ {queue_status['pending']} score update(s) waiting to sync.")
     
     if not st.session_state.flashcards:
         st.write("Ready to review? We'll pick 10 words you need to practice.")
@@ -384,19 +583,11 @@ with tab3:
                 st.session_state.balloons_shown = False
                 
                 with log_performance("Practice: Fetch & Sort Flashcards"):
-                    sheet = get_sheet()
-                    all_records = sheet.get_all_records()
+                    session_batch = get_store().practice_batch(10)
                 
-                if not all_records:
+                if not session_batch:
                     st.warning("No words saved yet! Go to the Dictionary tab to add some.")
                 else:
-                    for r in all_records:
-                        c = r.get('Count')
-                        if not isinstance(c, int):
-                            r['Count'] = 1 
-                            
-                    sorted_words = sorted(all_records, key=lambda x: x['Count'])
-                    session_batch = sorted_words[:10]
                     random.shuffle(session_batch)
                     
                     st.session_state.flashcards = session_batch
@@ -414,6 +605,7 @@ with tab3:
             if not st.session_state.balloons_shown:
                 st.balloons()
                 st.session_state.balloons_shown = True
+                get_score_queue().flush_async()
             
             st.success("🎉 Session Complete! Great job.")
             if st.button("Start New Session"):
@@ -449,7 +641,7 @@ with tab3:
                 
                 with col1:
                     if st.button("❌ Missed it"):
-                        with log_performance(f"Database: Update Score (Miss)"):
+                        with log_performance(f"Database: Queue Score (Miss)"):
                             update_score(word_text, success=False)
                         st.session_state.current_card_idx += 1
                         st.session_state.card_flipped = False
@@ -457,7 +649,7 @@ with tab3:
                 
                 with col2:
                     if st.button("✅ Got it"):
-                        with log_performance(f"Database: Update Score (Hit)"):
+                        with log_performance(f"Database: Queue Score (Hit)"):
                             update_score(word_text, success=True)
                         st.session_state.current_card_idx += 1
                         st.session_state.card_flipped = False
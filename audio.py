@@ -0,0 +1,29 @@
+"""Text-to-speech via gTTS, coalesced across sessions."""
+import io
+
+from gtts import gTTS
+
+import http_client
+from singleflight import SingleFlight
+
+_flights = SingleFlight("audio")
+
+
+def _synthesize(text, lang):
+    tts = gTTS(text=text, lang=lang, timeout=http_client.DEFAULT_TIMEOUT)
+    fp = io.BytesIO()
+    tts.write_to_fp(fp)
+    return fp.getvalue()
+
+
+def get_audio_bytes(text, lang='en'):
+    """MP3 audio for `text` as a BytesIO, or None if synthesis failed.
+
+    Identical concurrent requests (same text and language) share one gTTS call.
+    """
+    try:
+        data = _flights.do((text.lower().strip(), lang), _synthesize, text, lang)
+        return io.BytesIO(data)
+    except Exception as e:
+        print(f"Audio generation error: {e}")
+        return None
@@ -0,0 +1,89 @@
+"""Parsed dictionary results shared by the lookup engine, caches and UI.
+
+A lookup returns an Entry, a Suggestions list when the word was not found
+but close matches were, or None. Both classes use __slots__ and serialize
+to compact JSON arrays (`dumps`/`loads`) for the caches; Entry.to_row()
+gives the flat row the vocabulary table stores.
+"""
+import json
+
+# Bump when the serialized layout changes; caches drop older entries
+FORMAT_VERSION = 2
+
+
+class Entry:
+    """One headword: its senses grouped by part of speech, root, synonyms
+    and the source it came from.
+
+    `senses` is a sequence of (pos, [definition, ...]) pairs in display
+    order. A part of speech may have no definitions (MW sometimes only
+    cross-references another entry).
+    """
+
+    __slots__ = ("headword", "senses", "root", "synonyms", "source")
+
+    def __init__(self, headword, senses=(), root=None, synonyms=(), source=None):
+        self.headword = headword
+        self.senses = tuple((pos, tuple(defs)) for pos, defs in senses)
+        self.root = root
+        self.synonyms = tuple(synonyms)
+        self.source = source
+
+    def __repr__(self):
+        return f"Entry({self.headword!r}, pos={self.pos!r}, root={self.root!r}, source={self.source!r})"
+
+    @property
+    def pos(self):
+        return ", ".join(pos for pos, _ in self.senses)
+
+    def definition_lines(self):
+        """One "(pos) 1. ...; 2. ..." line per part of speech with definitions."""
+        return [f"({pos}) " + "; ".join(f"{i+1}. {d}" for i, d in enumerate(defs))
+                for pos, defs in self.senses if defs]
+
+    def definition_text(self):
+        """The lines joined with " | ", as stored in the Definition column."""
+        return " | ".join(self.definition_lines())
+
+    def to_row(self, source_label, date, count=1):
+        """A vocabulary row in storage.COLUMNS order."""
+        return [self.headword.title(), self.definition_text(), self.pos, source_label, date, count]
+
+    def to_compact(self):
+        return ["e", self.headword, [[pos, list(defs)] for pos, defs in self.senses],
+                self.root, list(self.synonyms), self.source]
+
+
+class Suggestions:
+    """Spellings offered for a word that was not found."""
+
+    __slots__ = ("words", "source")
+
+    def __init__(self, words, source=None):
+        self.words = tuple(words)
+        self.source = source
+
+    def __repr__(self):
+        return f"Suggestions({list(self.words)!r}, source={self.source!r})"
+
+    def to_compact(self):
+        return ["s", list(self.words), self.source]
+
+
+def from_compact(data):
+    """Inverse of to_compact(); None stays None."""
+    if data is None:
+        return None
+    if data[0] == "e":
+        return Entry(*data[1:])
+    if data[0] == "s":
+        return Suggestions(*data[1:])
+    raise ValueError(f"Unknown entry kind: {data[0]!r}")
+
+
+def dumps(result):
+    return json.dumps(None if result is None else result.to_compact(), separators=(",", ":"))
+
+
+def loads(text):
+    return from_compact(json.loads(text))
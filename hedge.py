@@ -0,0 +1,85 @@
+"""Hedged calls: a backup request for the slow tail of a latency distribution."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import metrics
+
+
+class Hedger:
+    """Runs a call and, if it has not answered within the recent
+    `percentile` latency, starts an identical one and returns whichever
+    succeeds first.
+
+    Until `min_samples` latencies have been seen there is nothing to base
+    the delay on and calls are not hedged. `before_hedge()` runs just
+    before the backup is started; if it raises, the call is not hedged.
+    The losing call is left to finish in the background.
+    """
+
+    def __init__(self, name, percentile=95, window=200, min_samples=20, min_delay=0.05, workers=8):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-hedge")
+        metrics.register_gauge(f"{name}.hedge_delay_ms", self._delay_ms)
+        metrics.register_gauge(f"{name}.hedge_rate", self.hedge_rate)
+
+    def delay(self):
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[index])
+
+    def _delay_ms(self):
+        delay = self.delay()
+        return "n/a" if delay is None else round(delay * 1000)
+
+    def hedge_rate(self):
+        calls = metrics.get(f"{self.name}.calls")
+        return f"{metrics.get(f'{self.name}.hedges') / calls:.1%}" if calls else "n/a"
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return result
+
+    def call(self, fn, *args, before_hedge=None):
+        metrics.incr(f"{self.name}.calls")
+        delay = self.delay()
+        if delay is None:
+            return self._timed(fn, *args)
+
+        primary = self._pool.submit(self._timed, fn, *args)
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+        try:
+            if before_hedge:
+                before_hedge()
+        except Exception:
+            metrics.incr(f"{self.name}.hedges_skipped")
+            return primary.result()
+        metrics.incr(f"{self.name}.hedges")
+        backup = self._pool.submit(self._timed, fn, *args)
+
+        pending = {primary, backup}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [f for f in done if f.exception() is None]
+            if succeeded:
+                winner = primary if primary in succeeded else backup
+                if winner is backup:
+                    metrics.incr(f"{self.name}.hedge_wins")
+                return winner.result()
+            if not pending:
+                # Both failed; report the original request's error
+                return primary.result()
@@ -0,0 +1,152 @@
+"""Shared HTTP client for outbound API calls.
+
+One pooled requests.Session per process gives keep-alive connection reuse
+with a cap on connections per host. Every call gets connect/read timeouts
+and bounded retries (except under prefixes mounted with without_retries(),
+for callers that retry themselves), and a per-host circuit breaker fails
+fast while a host keeps erroring instead of letting each rerun hang on it.
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import TimeoutError as Urllib3Timeout
+from urllib3.util.retry import Retry
+
+import metrics
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+def _is_timeout(error):
+    if isinstance(error, requests.Timeout):
+        return True
+    # Read timeouts that exhausted the retries arrive wrapped in a
+    # ConnectionError(MaxRetryError(reason=ReadTimeoutError))
+    reason = getattr(error.args[0] if error.args else None, "reason", None)
+    return isinstance(reason, Urllib3Timeout)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after
+    `reset_after` seconds one trial request is let through."""
+
+    def __init__(self, failure_threshold=5, reset_after=30):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_after:
+                # Half-open: let this request probe the host
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    metrics.incr("http.circuit_opened")
+                self._opened_at = time.monotonic()
+
+
+class HttpClient:
+    def __init__(self, pool_connections=10, pool_maxsize=10, timeout=DEFAULT_TIMEOUT,
+                 retries=2, backoff_factor=0.3, failure_threshold=5, reset_after=30):
+        self.timeout = timeout
+        self._breaker_args = (failure_threshold, reset_after)
+        self._breakers = {}
+        self._lock = threading.Lock()
+        retry = Retry(
+            total=retries, backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        # pool_block caps concurrent connections per host at pool_maxsize
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            max_retries=retry, pool_block=True,
+        )
+        self._no_retry_adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            max_retries=0, pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        metrics.register_gauge("http.connections_opened", lambda: self.pool_stats()[0])
+        metrics.register_gauge("http.connections_reused", lambda: self.pool_stats()[1])
+
+    def without_retries(self, prefix):
+        """Send every request for URLs under `prefix` exactly once, for
+        callers that need to see (and count) each attempt."""
+        self.session.mount(prefix, self._no_retry_adapter)
+
+    def _breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(*self._breaker_args)
+            return self._breakers[host]
+
+    def get(self, url, **kwargs):
+        breaker = self._breaker(urlsplit(url).netloc)
+        if not breaker.allow():
+            metrics.incr("http.circuit_rejected")
+            raise CircuitOpenError(f"{urlsplit(url).netloc} is failing; try again shortly")
+        kwargs.setdefault("timeout", self.timeout)
+        metrics.incr("http.requests")
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException as e:
+            metrics.incr("http.timeouts" if _is_timeout(e) else "http.errors")
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def pool_stats(self):
+        """(connections opened, requests served on a reused connection)."""
+        opened = requests_made = 0
+        for adapter in (self._adapter, self._no_retry_adapter):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    requests_made += pool.num_requests
+        return opened, max(0, requests_made - opened)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
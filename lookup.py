@@ -0,0 +1,337 @@
+"""Dictionary lookup engine, independent of the Streamlit UI.
+
+`LookupEngine.lookup(word)` resolves a single word with the same parsing,
+root and synonym rules the app has always used. `lookup_many(words)`
+resolves hundreds of words concurrently for imports, refresh jobs and other
+batch features.
+"""
+import asyncio
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+import requests
+
+import http_client
+import metrics
+import nlp
+from entry import Entry, Suggestions
+from mw_cache import MISS, cache_key
+from nlp import Lexicon, get_nltk_root, get_synonyms_nltk
+from singleflight import SingleFlight
+
+MW_PREFIX = "https://www.dictionaryapi.com/"
+MW_URL = MW_PREFIX + "api/v3/references/collegiate/json/{word}?key={key}"
+# Extra attempts after a connection error or 5xx; each one counts against the quota
+MW_RETRIES = 2
+MW_RETRY_STATUSES = (500, 502, 503, 504)
+MW_RETRY_BACKOFF = 0.3
+SOURCE = "Merriam-Webster"
+SPELLER_SOURCE = "Local speller"
+# Seconds a batch waits for WordNet before going ahead without it
+WARMUP_WAIT = 60
+
+# `data` is what lookup() returned; `error` is set instead when it raised
+LookupResult = namedtuple("LookupResult", "word data error")
+
+
+def run_stage(pool, fn, *args):
+    """Start fn(*args) on `pool` (or run it right away without one); returns a Future."""
+    if pool is not None:
+        return pool.submit(fn, *args)
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class LookupEngine:
+    """Merriam-Webster lookups behind the persistent cache.
+
+    With a `pool`, the independent stages of one lookup (WordNet synonyms,
+    validation of the lemma-based root guess) run while the main MW request
+    is in flight. Root candidates are checked against the local lexicon
+    first; MW is asked only about words it does not know.
+
+    An `offline` dictionary serves words MW cannot (errors, outages, "not
+    found"). In `fast_mode` it is asked first and MW only on a miss.
+    A `speller` answers obvious misspellings with local "Did you mean"
+    suggestions before any API call. Results carry a "source" naming where
+    they came from.
+
+    Every MW request is counted against the daily `quota`. While it is low,
+    root validation stays local and words are served from the cache or the
+    offline dictionary, calling MW only for words neither has.
+
+    With a `hedger`, a slow primary request is backed up by an identical
+    one; the backup counts against the quota too and is not sent while it
+    is low.
+
+    Failed MW requests are retried here rather than by the HTTP adapter,
+    so every attempt is counted. A caller passing its own `http` client
+    should not let it retry MW requests (see HttpClient.without_retries).
+    """
+
+    def __init__(self, api_key, cache=None, pool=None, lexicon=None, http=None,
+                 offline=None, fast_mode=False, speller=None, quota=None, hedger=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.pool = pool
+        self.offline = offline
+        self.fast_mode = fast_mode
+        self.speller = speller
+        self.quota = quota
+        self.hedger = hedger
+        self.lexicon = lexicon or Lexicon(cache)
+        if http is None:
+            http = http_client.get_client()
+            http.without_retries(MW_PREFIX)
+        self.http = http
+        self._flights = SingleFlight("lookup")
+        self._first_lookup = None  # (seconds, WordNet state at the time)
+        metrics.register_gauge("lookup.first_search", self._first_lookup_status)
+
+    # --- SINGLE WORD ---
+    def lookup(self, query, check_spelling=True):
+        """An Entry, Suggestions when only close spellings exist, or None.
+
+        Raises on API or network errors that the offline dictionary cannot
+        cover; those results are not cached. Concurrent lookups of the same
+        word share one fetch. Pass check_spelling=False to go past the
+        local speller.
+        """
+        if self._first_lookup is not None:
+            return self._lookup(query, check_spelling)
+        start = time.perf_counter()
+        try:
+            return self._lookup(query, check_spelling)
+        finally:
+            if self._first_lookup is None:
+                self._first_lookup = (time.perf_counter() - start, nlp.warmup.state)
+
+    def _first_lookup_status(self):
+        if self._first_lookup is None:
+            return "n/a"
+        seconds, wordnet_state = self._first_lookup
+        return f"{seconds * 1000:.0f} ms (WordNet {wordnet_state})"
+
+    def _lookup(self, query, check_spelling):
+        if check_spelling and self.speller is not None:
+            suggestions = self._local_suggestions(query)
+            if suggestions:
+                return Suggestions(suggestions, source=SPELLER_SOURCE)
+        if self.fast_mode and self.offline is not None:
+            data = self.offline.lookup(query)
+            if data:
+                return data
+        elif self.offline is not None and self._saving_quota():
+            return self._lookup_saving_quota(query)
+        try:
+            data = self._lookup_online(query)
+        except Exception:
+            data = self._offline_fallback(query)
+            if data is None:
+                raise
+            return data
+        return data or self._offline_fallback(query)
+
+    def _local_suggestions(self, query):
+        # Anything already answered by MW, or a word WordNet recognizes,
+        # is not a misspelling the speller should second-guess
+        if self.cache is not None and self.cache.contains(query):
+            return None
+        if self.lexicon.lookup(query) or nlp.is_wordnet_form(query):
+            return None
+        suggestions = self.speller.confident_suggestions(query)
+        metrics.incr("speller.local_suggestions" if suggestions else "speller.passed_to_api")
+        return suggestions
+
+    def _offline_fallback(self, query):
+        if self.offline is None or self.fast_mode:
+            # fast_mode already tried it
+            return None
+        data = self.offline.lookup(query)
+        if data:
+            metrics.incr("offline.fallbacks")
+        return data
+
+    def _saving_quota(self):
+        return self.quota is not None and self.quota.is_low()
+
+    def _lookup_saving_quota(self, query):
+        # Cache, then offline, and MW only for words neither has
+        cached = self._cached(query)
+        if cached is not MISS and cached:
+            return cached
+        data = self.offline.lookup(query)
+        if data:
+            metrics.incr("mw_quota.offline_served")
+            return data
+        if cached is not MISS:
+            # MW already said it does not know the word
+            return cached
+        return self._flights.do(cache_key(query), self._fetch_and_cache, query)
+
+    def _cached(self, query):
+        return MISS if self.cache is None else self.cache.get(query)
+
+    def _lookup_online(self, query):
+        data = self._cached(query)
+        if data is not MISS:
+            return data
+        return self._flights.do(cache_key(query), self._fetch_and_cache, query)
+
+    def _fetch_and_cache(self, query):
+        if self.cache is None:
+            return self.fetch(query)
+        # Another caller may have filled the cache while we were queued
+        data = self.cache.peek(query)
+        if data is MISS:
+            complete = nlp.warmup.settled()
+            data = self.fetch(query)
+            # While WordNet is still loading the entry lacks its root and
+            # synonyms; don't keep it. If loading failed, nothing better is
+            # coming, so cache as usual rather than pay MW on every search.
+            if complete:
+                self.cache.set(query, data)
+        return data
+
+    def _acquire(self, kind):
+        if self.quota is not None:
+            self.quota.acquire(kind)
+
+    def _get_json(self, word, kind="lookup"):
+        self._acquire(kind)
+        url = MW_URL.format(word=word, key=self.api_key)
+        if self.hedger is None or kind != "lookup" or self._saving_quota():
+            return self._request_json(url, kind)
+        return self.hedger.call(self._request_json, url, kind, before_hedge=lambda: self._acquire("hedge"))
+
+    def _request_json(self, url, kind="lookup"):
+        """GET `url`, retrying connection errors and 5xx responses; the
+        caller has acquired the first attempt, each retry acquires its own."""
+        for attempt in range(MW_RETRIES + 1):
+            if attempt:
+                time.sleep(MW_RETRY_BACKOFF * 2 ** (attempt - 1))
+                self._acquire(kind)
+                metrics.incr("lookup.retries")
+            try:
+                response = self.http.get(url)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MW_RETRIES:
+                    raise
+                continue
+            if response.status_code not in MW_RETRY_STATUSES or attempt == MW_RETRIES:
+                break
+        response.raise_for_status()
+        return response.json()
+
+    def remote_word_exists(self, candidate_word):
+        try:
+            d = self._get_json(candidate_word, kind="validation")
+            if not d or isinstance(d[0], str): return False
+            return True
+        except Exception: return False
+
+    def validate_word_exists(self, candidate_word):
+        if self._saving_quota():
+            # Optional request: an unconfirmed root is simply not shown
+            known = self.lexicon.lookup(candidate_word)
+            if known is None:
+                metrics.incr("mw_quota.validations_skipped")
+            return bool(known)
+        return self.lexicon.is_word(candidate_word, self.remote_word_exists)
+
+    def fetch(self, query):
+        """Uncached lookup. Roots and synonyms are left out until WordNet is loaded."""
+        target_clean = query.lower().strip()
+
+        # Independent stages, joined below once the entry has been parsed
+        synonyms_future = run_stage(self.pool, get_synonyms_nltk, query)
+        heuristic_guess = get_nltk_root(target_clean)
+        heuristic_future = (run_stage(self.pool, self.validate_word_exists, heuristic_guess)
+                            if heuristic_guess else None)
+
+        data = self._get_json(query)
+
+        if not data: return None
+        if isinstance(data[0], str): return Suggestions(data, source=SOURCE)
+
+        senses = {}  # pos -> definitions, in the order MW lists them
+        root_word_ref = None
+
+        first_entry_id = data[0].get("meta", {}).get("id", "").split(":")[0]
+        if first_entry_id and first_entry_id.lower() != target_clean:
+            if first_entry_id.lower() not in target_clean:
+                root_word_ref = first_entry_id.title()
+
+        if not root_word_ref:
+            for entry in data:
+                if isinstance(entry, dict) and "cxs" in entry:
+                    for cx in entry["cxs"]:
+                        for t in cx.get("cxtis", []):
+                            tgt = t.get("cxt", "")
+                            if tgt: root_word_ref = tgt.title()
+
+        if root_word_ref:
+            deeper_root = get_nltk_root(root_word_ref)
+            if deeper_root and self.validate_word_exists(deeper_root):
+                root_word_ref = deeper_root.title()
+        elif heuristic_future and heuristic_future.result():
+            root_word_ref = heuristic_guess.title()
+
+        for entry in data:
+            if not isinstance(entry, dict): continue
+            headword_info = entry.get("hwi", {})
+            hw = headword_info.get("hw", "").replace("*", "")
+
+            if (" " in hw or "-" in hw) and (hw.lower() != target_clean): continue
+
+            fl = entry.get("fl", "unknown")
+            senses.setdefault(fl, []).extend(entry.get("shortdef", []))
+
+        if not any(senses.values()) and not root_word_ref: return None
+
+        synonyms = synonyms_future.result()
+
+        return Entry(query, senses.items(), root=root_word_ref, synonyms=synonyms, source=SOURCE)
+
+    # --- BATCH ---
+    async def lookup_many_async(self, words, concurrency=16, on_result=None):
+        """Resolve `words` concurrently, at most `concurrency` at a time.
+
+        Returns one LookupResult per word, in input order; a failing word
+        never fails the batch. on_result(result, done, total) is called on
+        the event loop as each word finishes.
+        """
+        loop = asyncio.get_running_loop()
+        # Imported rows are stored for good, so wait for roots and synonyms,
+        # off the event loop and only for so long
+        await loop.run_in_executor(None, nlp.ensure_loaded, WARMUP_WAIT)
+        semaphore = asyncio.Semaphore(concurrency)
+        done = 0
+
+        async def resolve(word):
+            nonlocal done
+            async with semaphore:
+                try:
+                    # Batch callers have no "search anyway"; let MW judge spelling
+                    data = await loop.run_in_executor(executor, partial(self.lookup, word, check_spelling=False))
+                    result = LookupResult(word, data, None)
+                except Exception as e:
+                    result = LookupResult(word, None, str(e))
+            done += 1
+            if on_result:
+                on_result(result, done, len(words))
+            return result
+
+        # The HTTP client is blocking, so each in-flight lookup holds a thread
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lookup-many") as executor:
+            return await asyncio.gather(*(resolve(w) for w in words))
+
+    def lookup_many(self, words, concurrency=16, on_result=None):
+        """Blocking wrapper around lookup_many_async for callers without an event loop."""
+        return asyncio.run(self.lookup_many_async(words, concurrency, on_result))
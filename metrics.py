@@ -0,0 +1,40 @@
+"""Process-wide counters and gauges shown in the Diagnostics panel."""
+import threading
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+
+
+def incr(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def get(name, default=0):
+    with _lock:
+        return _counters.get(name, default)
+
+
+def register_gauge(name, fn):
+    """Report `fn()` under `name` every time a snapshot is taken."""
+    with _lock:
+        _gauges[name] = fn
+
+
+def snapshot():
+    """All metrics as [{"Metric", "Value"}] rows, sorted by name."""
+    with _lock:
+        values = dict(_counters)
+        gauges = dict(_gauges)
+    for name, fn in gauges.items():
+        try:
+            values[name] = fn()
+        except Exception as e:
+            values[name] = f"error: {e}"
+    return [{"Metric": k, "Value": str(values[k])} for k in sorted(values)]
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,99 @@
+"""Persistent, size-bounded cache of parsed dictionary lookups.
+
+Entries live in a local SQLite file so they survive restarts; the
+Merriam-Webster free tier caps daily requests. Results are keyed by the
+normalized query and expire after a TTL (shorter for "not found" and
+suggestion results); beyond `max_entries` the least recently used are
+evicted. Values are stored in entry.py's compact form; entries written in
+an older format are dropped when the cache is opened.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import entry
+import metrics
+from entry import Entry
+
+MISS = object()
+
+
+def cache_key(query):
+    return str(query).lower().strip()
+
+
+class LookupCache:
+    def __init__(self, path, max_entries=5000, ttl=30 * 86400, negative_ttl=86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_lookups_accessed ON lookups (accessed_at)")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != entry.FORMAT_VERSION:
+                self._conn.execute("DELETE FROM lookups")
+                self._conn.execute(f"PRAGMA user_version = {entry.FORMAT_VERSION}")
+
+    def get(self, query):
+        """The cached result for `query` (which may be None), or MISS."""
+        key = cache_key(query)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM lookups WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM lookups WHERE key = ?", (key,))
+                metrics.incr("mw_cache.misses")
+                return MISS
+            self._conn.execute("UPDATE lookups SET accessed_at = ? WHERE key = ?", (now, key))
+        metrics.incr("mw_cache.hits")
+        return entry.loads(row[0])
+
+    def peek(self, query):
+        """Like get(), but neither counted nor treated as an access."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM lookups WHERE key = ? AND expires_at >= ?",
+                (cache_key(query), time.time())).fetchone()
+        return MISS if row is None else entry.loads(row[0])
+
+    def contains(self, query):
+        """Whether a live entry exists; unlike get() this is not counted as a hit."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM lookups WHERE key = ? AND expires_at >= ?",
+                (cache_key(query), time.time())).fetchone() is not None
+
+    def set(self, query, value):
+        negative = not isinstance(value, Entry)
+        now = time.time()
+        expires_at = now + (self.negative_ttl if negative else self.ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (cache_key(query), entry.dumps(value), expires_at, now),
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM lookups WHERE key IN "
+                    "(SELECT key FROM lookups ORDER BY accessed_at LIMIT ?)", (excess,))
+                metrics.incr("mw_cache.evictions", excess)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
@@ -0,0 +1,90 @@
+"""Persistent per-day count of Merriam-Webster API requests.
+
+The MW key has a hard daily cap shared by every session and restart, so
+requests are counted in a small SQLite file by UTC day and by kind:
+"lookup" for the entry a user asked for, "validation" for the existence
+checks made while resolving root words, and "hedge" for backup requests
+sent when a lookup is slow.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import metrics
+
+KINDS = ("lookup", "validation", "hedge")
+
+
+class QuotaExceededError(Exception):
+    """Raised instead of making a request once today's cap is used up."""
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class DailyQuota:
+    """Counts MW requests per day against `daily_limit`.
+
+    Once fewer than `reserve` requests are left the quota is "low" and
+    callers should drop optional requests; at zero acquire() refuses.
+    """
+
+    def __init__(self, path, daily_limit=1000, reserve=200):
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS requests (
+                    day TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, kind)
+                )""")
+        for kind in KINDS:
+            metrics.register_gauge(f"mw_quota.today.{kind}", lambda kind=kind: self.used(kind))
+        metrics.register_gauge("mw_quota.remaining", self.remaining)
+
+    def acquire(self, kind):
+        """Count one request of `kind`, or raise QuotaExceededError."""
+        day = _today()
+        with self._lock, self._conn:
+            used = self._conn.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM requests WHERE day = ?", (day,)).fetchone()[0]
+            if used >= self.daily_limit:
+                metrics.incr("mw_quota.refused")
+                raise QuotaExceededError(
+                    f"Daily Merriam-Webster limit of {self.daily_limit} requests reached")
+            self._conn.execute(
+                "INSERT INTO requests (day, kind, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, kind) DO UPDATE SET count = count + 1", (day, kind))
+
+    def used(self, kind=None):
+        """Requests made today, of one kind or in total."""
+        sql = "SELECT COALESCE(SUM(count), 0) FROM requests WHERE day = ?"
+        params = (_today(),)
+        if kind is not None:
+            sql += " AND kind = ?"
+            params += (kind,)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def usage(self):
+        """{kind: requests today} for every kind seen today."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, count FROM requests WHERE day = ?", (_today(),)).fetchall()
+        return dict(rows)
+
+    def remaining(self):
+        return max(0, self.daily_limit - self.used())
+
+    def is_low(self):
+        return self.remaining() <= self.reserve
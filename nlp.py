@@ -0,0 +1,315 @@
+"""NLTK/WordNet helpers: roots, synonyms and a local lexicon.
+
+WordNet is loaded by a background warm-up, started once per process. Until
+it is ready the helpers answer as if WordNet knew nothing (no root, no
+synonyms) instead of making the caller wait for the corpus.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import nltk
+from nltk.stem import WordNetLemmatizer
+from nltk.corpus import wordnet
+
+import metrics
+from entry import Entry
+from mw_cache import MISS
+
+lemmatizer = WordNetLemmatizer()
+
+
+# --- NLTK SETUP (once per process, in the background) ---
+class WarmUp:
+    """Downloads WordNet if needed and loads it in a background thread.
+
+    State goes "cold" -> "loading" -> "ready" (or "failed"). Callbacks
+    registered with on_ready() run once it is ready.
+    """
+
+    def __init__(self):
+        self.state = "cold"
+        self.error = None
+        self.seconds = None
+        self._started_at = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._callbacks = []
+
+    def start(self):
+        with self._lock:
+            if self.state != "cold":
+                return
+            self.state = "loading"
+            self._started_at = time.perf_counter()
+        threading.Thread(target=self._run, name="wordnet-warmup", daemon=True).start()
+
+    def _run(self):
+        try:
+            try:
+                nltk.data.find('corpora/wordnet.zip')
+            except LookupError:
+                nltk.download('wordnet')
+                nltk.download('omw-1.4')
+            # WordNet's lazy loader is not thread-safe on first use
+            wordnet.ensure_loaded()
+            # Also loads the morphology exception lists
+            lemmatizer.lemmatize("warming", pos='v')
+            state = "ready"
+        except Exception as e:
+            print(f"WordNet warm-up failed: {e}")
+            self.error = str(e)
+            state = "failed"
+        with self._lock:
+            self.seconds = time.perf_counter() - self._started_at
+            self.state = state
+            callbacks = list(self._callbacks) if state == "ready" else []
+        self._done.set()
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception as e:
+                print(f"WordNet ready callback failed: {e}")
+
+    def ready(self):
+        return self.state == "ready"
+
+    def settled(self):
+        """Whether loading is over, successfully or not. Results computed
+        after a failure are as complete as they will ever get."""
+        return self.state in ("ready", "failed")
+
+    def wait(self, timeout=None):
+        """Start if needed and block until done; returns ready()."""
+        self.start()
+        self._done.wait(timeout)
+        return self.ready()
+
+    def on_ready(self, fn):
+        with self._lock:
+            if self.state != "ready":
+                self._callbacks.append(fn)
+                return
+        fn()
+
+    def status(self):
+        if self.state == "ready":
+            return f"ready (loaded in {self.seconds:.1f} s)"
+        if self.state == "loading":
+            return f"loading ({time.perf_counter() - self._started_at:.0f} s so far)"
+        if self.state == "failed":
+            return f"failed: {self.error}"
+        return "not started"
+
+
+warmup = WarmUp()
+metrics.register_gauge("nlp.wordnet", warmup.status)
+
+
+def ensure_loaded(timeout=None):
+    """Block until WordNet is loaded (or `timeout` passes); for background
+    jobs that need all of it. Returns whether it is ready."""
+    return warmup.wait(timeout)
+
+
+def _available():
+    if warmup.ready():
+        return True
+    warmup.start()
+    metrics.incr("nlp.degraded_calls")
+    return False
+
+
+def is_wordnet_form(word):
+    """Whether WordNet knows `word` directly or as an inflection ("cats")."""
+    if not _available():
+        return False
+    return bool(wordnet.synsets(word.strip().replace(' ', '_')))
+
+
+# --- NLTK ROOT LOGIC ---
+# Parts of speech tried for lemmas, in priority order; the root is the
+# first lemma from ROOT_POS that differs from the word
+LEMMA_POS = ('n', 'v', 'a', 'r')
+ROOT_POS = ('n', 'v', 'a')
+
+
+class RootResolver:
+    """Lemmas of words across parts of speech, memoized in a bounded LRU.
+
+    candidates() gives every distinct lemma a word has, as (pos, lemma)
+    pairs; the batch forms take whole token lists, look the memo up once
+    and lemmatize only the distinct words it lacks. Nothing is memoized
+    before WordNet is loaded.
+    """
+
+    def __init__(self, maxsize=50000):
+        self.maxsize = maxsize
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lemmatize(w):
+        pairs = []
+        for pos in LEMMA_POS:
+            lemma = lemmatizer.lemmatize(w, pos=pos)
+            if lemma != w and lemma not in (l for _, l in pairs):
+                pairs.append((pos, lemma))
+        return tuple(pairs)
+
+    def candidates_many(self, words):
+        """{normalized word: ((pos, lemma), ...)} for every word in `words`."""
+        norms = {word.lower().strip() for word in words}
+        norms.discard("")
+        if not _available():
+            return {w: () for w in norms}
+        found = {}
+        with self._lock:
+            for w in norms:
+                if w in self._memo:
+                    self._memo.move_to_end(w)
+                    found[w] = self._memo[w]
+        missing = norms - found.keys()
+        metrics.incr("roots.memo_hits", len(found))
+        metrics.incr("roots.memo_misses", len(missing))
+        computed = {w: self._lemmatize(w) for w in missing}
+        with self._lock:
+            self._memo.update(computed)
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+        found.update(computed)
+        return found
+
+    def candidates(self, word):
+        return self.candidates_many([word]).get(word.lower().strip(), ())
+
+    def roots_many(self, words):
+        """get_nltk_root() for each of `words`, in order."""
+        candidates = self.candidates_many(words)
+        return [self._root(candidates.get(word.lower().strip(), ())) for word in words]
+
+    def root(self, word):
+        return self._root(self.candidates(word))
+
+    @staticmethod
+    def _root(pairs):
+        for pos, lemma in pairs:
+            if pos in ROOT_POS:
+                return lemma
+        return None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memo)
+
+
+roots = RootResolver()
+metrics.register_gauge("roots.memo_size", lambda: len(roots))
+
+
+def get_nltk_root(word):
+    """The word's lemma as a noun, verb or adjective (first that differs), or None."""
+    return roots.root(word)
+
+
+# --- NLTK SYNONYM LOGIC ---
+MAX_SYNONYMS = 5
+
+# Precomputed synonym lists (synonym_index.SynonymIndex), set by the app
+synonym_index = None
+
+
+def use_synonym_index(index):
+    global synonym_index
+    synonym_index = index
+
+
+# nltk reads SemCor counts with seek/readline on one shared file handle, so
+# concurrent lemma.count() calls can read each other's lines
+_count_lock = threading.Lock()
+
+# Full-corpus builds (synonym index, offline dictionary, spelling index) run
+# one at a time instead of competing for the corpus and the count file
+BUILD_LOCK = threading.Lock()
+
+
+def lemma_count(lemma):
+    """lemma.count(), safe to call from several threads."""
+    with _count_lock:
+        return lemma.count()
+
+
+def rank_synonyms(word, k=MAX_SYNONYMS):
+    """The top `k` WordNet synonyms of `word`, most used first.
+
+    Ranked by SemCor tag count summed over the word's senses, then by
+    WordNet's sense order, so the result is stable across runs.
+    """
+    target = word.lower().strip().replace('_', ' ')
+    scores = {}  # synonym -> (count, first position)
+    position = 0
+    for syn in wordnet.synsets(word):
+        for lemma in syn.lemmas():
+            clean_syn = lemma.name().replace('_', ' ')
+            if clean_syn.lower() == target:
+                continue
+            count, first = scores.get(clean_syn, (0, position))
+            scores[clean_syn] = (count + lemma_count(lemma), first)
+            position += 1
+    ranked = sorted(scores, key=lambda s: (-scores[s][0], scores[s][1]))
+    return ranked[:k]
+
+
+def get_synonyms_nltk(word):
+    if synonym_index is not None:
+        synonyms = synonym_index.get(word)
+        if synonyms is not None:
+            return synonyms
+    if not _available():
+        return []
+    try:
+        return rank_synonyms(word)
+    except Exception:
+        return []
+
+
+# --- LOCAL LEXICON ---
+class Lexicon:
+    """Local answers to "is this a real dictionary word?".
+
+    A word is known if it is a WordNet lemma or has a cached dictionary
+    entry, and unknown if the cache remembers it was not found. Only words
+    neither source knows need a remote check.
+    """
+
+    def __init__(self, cache=None):
+        self._cache = cache
+
+    def lookup(self, word):
+        """True/False when answerable locally, None when only the API can tell."""
+        w = word.lower().strip().replace(' ', '_')
+        if warmup.ready() and wordnet.lemmas(w):
+            return True
+        if self._cache is not None:
+            cached = self._cache.peek(word)
+            if cached is not MISS:
+                return isinstance(cached, Entry)
+        return None
+
+    def is_word(self, word, remote_check):
+        """lookup(), falling back to `remote_check(word)` for unknown words."""
+        known = self.lookup(word)
+        if known is not None:
+            metrics.incr("lexicon.local_answers")
+            return known
+        metrics.incr("lexicon.remote_fallbacks")
+        return remote_check(word)
+
+    @staticmethod
+    def fallback_rate():
+        remote = metrics.get("lexicon.remote_fallbacks")
+        total = remote + metrics.get("lexicon.local_answers")
+        return f"{remote / total:.0%}" if total else "n/a"
+
+
+metrics.register_gauge("lexicon.remote_fallback_rate", Lexicon.fallback_rate)
@@ -0,0 +1,130 @@
+"""Offline dictionary compiled from WordNet glosses.
+
+The compiled store is a memory-mapped string table (see sstable.py) mapping
+each WordNet lemma to its part(s) of speech, short definitions and
+synonyms (copied from the synonym index, which is built first if missing).
+It is opened lazily on first use; if the file is missing it is built once
+in a background thread. Build it ahead of time with:
+
+    python offline_dict.py build [path]
+"""
+import json
+import os
+import sys
+import threading
+
+import metrics
+import nlp
+import synonym_index
+from entry import Entry
+from nlp import get_nltk_root
+from sstable import SSTable, write_table
+
+SOURCE = "WordNet (offline)"
+# Named after the entry layout so a format change never reads an old file
+FILE_NAME = "wordnet_dict.v2.sst"
+DEFAULT_PATH = os.path.join(".vocab_cache", FILE_NAME)
+POS_NAMES = {"n": "noun", "v": "verb", "a": "adjective", "s": "adjective", "r": "adverb"}
+SENSES_PER_POS = 3
+
+
+def _compile_entry(name, synonyms):
+    from nltk.corpus import wordnet
+
+    senses = {}
+    for syn in wordnet.synsets(name):
+        pos = POS_NAMES.get(syn.pos(), syn.pos())
+        glosses = senses.setdefault(pos, [])
+        if len(glosses) < SENSES_PER_POS:
+            glosses.append(syn.definition())
+    # [senses, synonyms], in Entry's compact layout
+    return [[[pos, glosses] for pos, glosses in senses.items()], synonyms.get(name) or []]
+
+
+def _synonyms_beside(path):
+    return synonym_index.SynonymIndex(os.path.join(os.path.dirname(path), synonym_index.FILE_NAME))
+
+
+def build(path=DEFAULT_PATH, synonyms=None):
+    """Compile the store; synonym lists come from `synonyms` (a
+    SynonymIndex, by default the one beside `path`), built first if missing."""
+    from nltk.corpus import wordnet
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    synonyms = synonyms or _synonyms_beside(path)
+    synonyms.ensure_built()
+    with nlp.BUILD_LOCK:
+        names = {n.replace('_', ' ').lower() for n in wordnet.all_lemma_names()}
+        write_table(path, ((n, json.dumps(_compile_entry(n.replace(' ', '_'), synonyms),
+                                          separators=(",", ":")).encode("utf-8"))
+                           for n in names))
+
+
+class OfflineDictionary:
+    """The compiled WordNet store. Synonyms are taken from `synonyms`, a
+    SynonymIndex (by default the one beside `path`)."""
+
+    def __init__(self, path=DEFAULT_PATH, synonyms=None):
+        self.path = path
+        self._synonyms = synonyms or _synonyms_beside(path)
+        self._table = None
+        self._lock = threading.Lock()
+        self._building = False
+
+    def _open(self):
+        with self._lock:
+            if self._table is not None:
+                return self._table
+            if os.path.exists(self.path):
+                self._table = SSTable(self.path)
+                return self._table
+            if not self._building:
+                self._building = True
+                threading.Thread(target=self._build, name="offline-dict-build", daemon=True).start()
+            return None
+
+    def _build(self):
+        try:
+            nlp.ensure_loaded()
+            build(self.path, self._synonyms)
+        except Exception as e:
+            print(f"Offline dictionary build failed: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def ready(self):
+        return self._open() is not None
+
+    def _entry(self, key):
+        raw = self._table.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def lookup(self, query):
+        """An Entry like LookupEngine.lookup's, or None.
+
+        Inflected forms resolve to their lemma's entry, which then becomes
+        the root link, as with Merriam-Webster.
+        """
+        if self._open() is None:
+            return None
+        target_clean = query.lower().strip()
+        root = get_nltk_root(target_clean)
+        entry = self._entry(target_clean)
+        root_ref = root.title() if root and self._entry(root) else None
+        if entry is None and root_ref:
+            entry = self._entry(root)
+        if entry is None:
+            metrics.incr("offline.misses")
+            return None
+        metrics.incr("offline.hits")
+        senses, synonyms = entry
+        return Entry(query, senses, root=root_ref, synonyms=synonyms, source=SOURCE)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python offline_dict.py build [path]")
+    build(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH)
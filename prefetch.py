@@ -0,0 +1,72 @@
+"""Speculative prefetch of the words a user is likely to click next."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from mw_cache import cache_key
+
+
+class Prefetcher:
+    """Warms the lookup cache in the background.
+
+    `lookup(word)` must fetch and cache a word. At most `per_page` words are
+    scheduled per call, and no more than `daily_budget` prefetches are made
+    in any 24 hours across all sessions, so speculation cannot use up the
+    dictionary API's daily quota. Nothing is prefetched while the shared
+    `quota` is low.
+    """
+
+    def __init__(self, lookup, cache, per_page=4, daily_budget=100, workers=2, quota=None):
+        self._lookup = lookup
+        self._cache = cache
+        self._quota = quota
+        self.per_page = per_page
+        self.daily_budget = daily_budget
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._spent = deque()  # timestamps of prefetches in the last 24 hours
+        metrics.register_gauge("prefetch.budget_left", self.budget_left)
+
+    def budget_left(self):
+        with self._lock:
+            cutoff = time.time() - 86400
+            while self._spent and self._spent[0] < cutoff:
+                self._spent.popleft()
+            return self.daily_budget - len(self._spent)
+
+    def schedule(self, words):
+        """Queue the first `per_page` uncached words, in priority order."""
+        if self._quota is not None and self._quota.is_low():
+            metrics.incr("prefetch.skipped_quota")
+            return
+        scheduled = 0
+        for word in words:
+            if scheduled >= self.per_page:
+                break
+            key = cache_key(word)
+            if not key or self._cache.contains(key):
+                continue
+            if self.budget_left() <= 0:
+                metrics.incr("prefetch.skipped_budget")
+                break
+            with self._lock:
+                if key in self._inflight:
+                    continue
+                self._inflight.add(key)
+                self._spent.append(time.time())
+            self._pool.submit(self._run, word, key)
+            scheduled += 1
+
+    def _run(self, word, key):
+        try:
+            self._lookup(word)
+            metrics.incr("prefetch.fetched")
+        except Exception as e:
+            metrics.incr("prefetch.errors")
+            print(f"Prefetch error for '{word}': {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
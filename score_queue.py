@@ -0,0 +1,124 @@
+"""Write-behind queue for flashcard scores."""
+import json
+import os
+import threading
+import time
+
+from storage import normalize_word
+
+
+class ScoreQueue:
+    """Collects graded cards in memory and writes them in one batch.
+
+    A background thread flushes the queue once `flush_every` words are
+    pending, every `flush_interval` seconds, or when `flush_async()` is
+    called at the end of a session. Re-grading a word before it is flushed
+    simply replaces its pending Count. The queue is journaled to disk so a
+    crash or restart does not lose grades; they are retried on startup.
+    """
+
+    def __init__(self, store, journal_path, flush_every=5, flush_interval=30):
+        self._store = store
+        self._journal_path = journal_path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = {}      # normalized word -> (word, count)
+        self._failed = set()    # normalized words whose last write failed
+        self._last_error = None
+        self._flush_requested = False
+        self._load_journal()
+        store.add_refresh_hook(self._reapply)
+        self._thread = threading.Thread(target=self._run, name="score-flusher", daemon=True)
+        self._thread.start()
+
+    # --- PUBLIC API ---
+    def record(self, word, count):
+        """Queue a new Count for `word`; the snapshot sees it immediately."""
+        self._store.set_count(word, count)
+        with self._lock:
+            self._pending[normalize_word(word)] = (word, count)
+            self._save_journal()
+            if len(self._pending) >= self.flush_every:
+                self._flush_requested = True
+                self._wakeup.notify()
+
+    def flush_async(self):
+        with self._lock:
+            self._flush_requested = True
+            self._wakeup.notify()
+
+    def flush(self):
+        """Write everything pending in a single batch. Returns True on success."""
+        with self._lock:
+            batch = dict(self._pending)
+        if not batch:
+            return True
+        try:
+            self._store.write_counts({word: count for word, count in batch.values()})
+        except Exception as e:
+            with self._lock:
+                self._failed.update(batch)
+                self._last_error = str(e)
+            print(f"Error flushing scores: {e}")
+            return False
+        with self._lock:
+            for key, entry in batch.items():
+                # Leave entries that were re-graded while the batch was in flight
+                if self._pending.get(key) == entry:
+                    del self._pending[key]
+                    self._failed.discard(key)
+            self._last_error = None
+            self._save_journal()
+        return True
+
+    def status(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "failed": len(self._failed),
+                "last_error": self._last_error,
+            }
+
+    # --- BACKGROUND FLUSHER ---
+    def _run(self):
+        last_flush = time.time()
+        while True:
+            with self._lock:
+                # A flush requested while the last one ran has already notified
+                if not self._flush_requested:
+                    self._wakeup.wait(timeout=self.flush_interval)
+                due = self._flush_requested or time.time() - last_flush >= self.flush_interval
+                self._flush_requested = False
+            if due:
+                self.flush()
+                last_flush = time.time()
+
+    def _reapply(self):
+        # A snapshot reload brings back the sheet's Counts; pending grades
+        # have not reached the sheet yet and must win.
+        with self._lock:
+            entries = list(self._pending.values())
+        for word, count in entries:
+            self._store.set_count(word, count)
+
+    # --- JOURNAL ---
+    def _load_journal(self):
+        try:
+            with open(self._journal_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for word, count in saved:
+            self._pending[normalize_word(word)] = (word, count)
+
+    def _save_journal(self):
+        # Called with self._lock held
+        tmp_path = self._journal_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(list(self._pending.values()), f)
+            os.replace(tmp_path, self._journal_path)
+        except OSError as e:
+            print(f"Error saving score journal: {e}")
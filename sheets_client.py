@@ -0,0 +1,135 @@
+"""Quota-aware wrapper around a gspread worksheet.
+
+Google Sheets allows a fixed number of read and write requests per minute.
+Every session on the server shares one worksheet wrapper, so requests are
+paced by shared token buckets, and 429/5xx answers are retried with
+jittered exponential backoff instead of surfacing as failed reads or saves.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+from gspread.exceptions import APIError
+
+import metrics
+
+READ_METHODS = {
+    "acell", "batch_get", "cell", "col_values", "find", "findall", "get",
+    "get_all_records", "get_all_values", "get_values", "row_values",
+}
+WRITE_METHODS = {
+    "append_row", "append_rows", "batch_update", "delete_rows", "insert_row",
+    "insert_rows", "update", "update_acell", "update_cell", "update_cells",
+}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` requests per minute, with bursts up to `capacity`.
+
+    The bucket smooths requests out; a sliding window over the last 60
+    seconds additionally guarantees the per-minute quota itself is never
+    exceeded, which a full bucket plus a minute of refill would allow.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_minute = rate_per_minute
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 6)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._recent = deque()  # monotonic timestamps of granted tokens
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _expire(self, now):
+        cutoff = now - 60
+        while self._recent and self._recent[0] <= cutoff:
+            self._recent.popleft()
+
+    def acquire(self):
+        """Block until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                self._expire(now)
+                if len(self._recent) >= self.rate_per_minute:
+                    # Window full: wait for its oldest request to age out
+                    delay = self._recent[0] + 60 - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._recent.append(now)
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def used_last_minute(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._recent)
+
+
+def _status_of(error):
+    code = getattr(error, "code", None)
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code
+
+
+class QuotaAwareWorksheet:
+    """Drop-in proxy for a gspread Worksheet.
+
+    Known read and write methods go through the matching token bucket and
+    are retried on retryable API errors; everything else is passed through.
+    """
+
+    def __init__(self, worksheet, read_bucket, write_bucket,
+                 max_retries=5, base_delay=1.0, max_delay=32.0):
+        self._worksheet = worksheet
+        self._buckets = {"read": read_bucket, "write": write_bucket}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        for kind, bucket in self._buckets.items():
+            metrics.register_gauge(f"sheets.{kind}.last_minute", bucket.used_last_minute)
+
+    def __getattr__(self, name):
+        attr = getattr(self._worksheet, name)
+        if name in READ_METHODS:
+            kind = "read"
+        elif name in WRITE_METHODS:
+            kind = "write"
+        else:
+            return attr
+
+        def call(*args, **kwargs):
+            return self._call(kind, attr, args, kwargs)
+        return call
+
+    def _call(self, kind, fn, args, kwargs):
+        bucket = self._buckets[kind]
+        for attempt in range(self.max_retries + 1):
+            waited = bucket.acquire()
+            if waited:
+                metrics.incr(f"sheets.{kind}.throttled")
+            metrics.incr(f"sheets.{kind}.requests")
+            try:
+                return fn(*args, **kwargs)
+            except APIError as e:
+                status = _status_of(e)
+                if status == 429:
+                    metrics.incr("sheets.http_429")
+                if status not in RETRYABLE_STATUS or attempt == self.max_retries:
+                    metrics.incr("sheets.errors")
+                    raise
+                metrics.incr("sheets.retries")
+                # Full jitter keeps concurrent sessions from retrying in lockstep
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
@@ -0,0 +1,173 @@
+"""Local spelling suggestions with the symmetric-delete (SymSpell) method.
+
+Every lexicon word is indexed under the strings obtained by deleting up to
+`max_distance` characters from its first `prefix_length` characters. A
+query generates the same deletes, so candidate corrections are found with a
+handful of dict lookups instead of a scan of the lexicon; only those
+candidates get a real edit-distance check.
+"""
+import threading
+
+import nlp
+
+# Saved words outrank any WordNet frequency
+USER_WORD_FREQUENCY = 10 ** 6
+
+# WordNet only has nouns, verbs, adjectives and adverbs; these closed-class
+# words are real but absent from it, and are among the most frequent in text
+FUNCTION_WORDS = frozenset("""
+    a about above across after against along although am among an and another any
+    anybody anyone anything are around as at be because been before behind being
+    below beneath beside besides between beyond both but by can could did do does
+    doing down during each either every everybody everyone everything few for from
+    had has have having he her hers herself him himself his how however i if in
+    inside into is it its itself least less many me might mine more most much must
+    my myself neither nobody none nor nothing of off on once one onto or other
+    others ought our ours ourselves out outside over own per several shall she
+    should since so some somebody someone something such than that the their theirs
+    them themselves then there these they this those though through throughout till
+    to toward towards under underneath unless unlike until up upon us via was we
+    were what whatever when whenever where whereas wherever whether which whichever
+    while who whoever whom whomever whose why will with within without would yet
+    you your yours yourself yourselves
+""".split())
+FUNCTION_WORD_FREQUENCY = 10 ** 5
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 if larger."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        # A transposition can still reach back to the previous row
+        if min(cur) > max_distance and min(prev) >= max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def wordnet_frequencies():
+    """{word: frequency} for single-word WordNet lemmas seen in the SemCor
+    tagged corpus. Untagged (rare) lemmas are left out to keep the delete
+    index small."""
+    from nltk.corpus import wordnet
+
+    frequencies = {}
+    for syn in wordnet.all_synsets():
+        for lemma in syn.lemmas():
+            name = lemma.name().lower()
+            if name.isalpha():
+                count = nlp.lemma_count(lemma)
+                if count:
+                    frequencies[name] = frequencies.get(name, 0) + count
+    return frequencies
+
+
+class SpellSuggester:
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._frequencies = {}
+        self._deletes = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    # --- INDEX ---
+    def _delete_variants(self, word):
+        key = word[:self.prefix_length]
+        variants = {key}
+        frontier = [key]
+        for _ in range(self.max_distance):
+            next_frontier = []
+            for w in frontier:
+                for i in range(len(w)):
+                    v = w[:i] + w[i + 1:]
+                    if v not in variants:
+                        variants.add(v)
+                        next_frontier.append(v)
+            frontier = next_frontier
+        return variants
+
+    def add(self, word, frequency=1):
+        w = word.lower().strip()
+        if not w:
+            return
+        with self._lock:
+            if w in self._frequencies:
+                self._frequencies[w] = max(self._frequencies[w], frequency)
+                return
+            self._frequencies[w] = frequency
+            for d in self._delete_variants(w):
+                self._deletes.setdefault(d, []).append(w)
+
+    def add_user_word(self, word):
+        self.add(word, USER_WORD_FREQUENCY)
+
+    def load_async(self, user_words=()):
+        """Index WordNet and the saved words in a background thread."""
+        threading.Thread(target=self._load, args=(list(user_words),),
+                         name="spell-index", daemon=True).start()
+
+    def _load(self, user_words):
+        try:
+            for word in user_words:
+                self.add_user_word(word)
+            for word in FUNCTION_WORDS:
+                self.add(word, FUNCTION_WORD_FREQUENCY)
+            nlp.ensure_loaded()
+            with nlp.BUILD_LOCK:
+                frequencies = wordnet_frequencies()
+            for word, frequency in frequencies.items():
+                self.add(word, frequency)
+            self._ready.set()
+        except Exception as e:
+            print(f"Spelling index failed: {e}")
+
+    def ready(self):
+        return self._ready.is_set()
+
+    # --- QUERIES ---
+    def knows(self, word):
+        w = word.lower().strip()
+        return w in FUNCTION_WORDS or w in self._frequencies
+
+    def lookup(self, query, limit=9):
+        """[(word, distance, frequency)] closest first, then most frequent."""
+        q = query.lower().strip()
+        candidates = set()
+        with self._lock:
+            for d in self._delete_variants(q):
+                candidates.update(self._deletes.get(d, ()))
+            frequencies = {c: self._frequencies[c] for c in candidates}
+        results = []
+        for c in candidates:
+            distance = edit_distance(q, c, self.max_distance)
+            if distance <= self.max_distance:
+                results.append((c, distance, frequencies[c]))
+        results.sort(key=lambda r: (r[1], -r[2], r[0]))
+        return results[:limit]
+
+    def confident_suggestions(self, query, limit=9):
+        """Suggestions worth showing without asking the API, or None.
+
+        Confidence needs the index to be loaded, an alphabetic query the
+        index does not know, and a correction one edit away (two for
+        queries of six letters or more, which have fewer neighbours).
+        """
+        q = query.lower().strip()
+        if not self.ready() or len(q) < 3 or not q.isalpha() or self.knows(q):
+            return None
+        results = self.lookup(q, limit)
+        if not results:
+            return None
+        best = results[0][1]
+        if best == 1 or (best == 2 and len(q) >= 6):
+            return [w for w, _, _ in results]
+        return None
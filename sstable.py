@@ -0,0 +1,76 @@
+"""Read-only sorted string tables, memory-mapped for lookups.
+
+Layout: a header (magic, entry count), a fixed-width index of
+(key offset, key length, value offset, value length) records sorted by key,
+then the key and value bytes. Lookups binary-search the index in place, so
+opening a table costs no parsing and worker processes share its pages
+through the OS page cache.
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b"VOCABST1"
+_HEADER = struct.Struct("<8sQ")
+_ENTRY = struct.Struct("<QIQI")
+
+
+def write_table(path, items):
+    """Write {str: bytes} `items` (any iterable of pairs) as a table at `path`.
+
+    The file is written beside `path` and renamed into place, so readers
+    never see a partial table.
+    """
+    entries = sorted((k.encode("utf-8"), v) for k, v in dict(items).items())
+    data_start = _HEADER.size + _ENTRY.size * len(entries)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(entries)))
+        offset = data_start
+        for key, value in entries:
+            f.write(_ENTRY.pack(offset, len(key), offset + len(key), len(value)))
+            offset += len(key) + len(value)
+        for key, value in entries:
+            f.write(key)
+            f.write(value)
+    os.replace(tmp_path, path)
+
+
+class SSTable:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a string table")
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, i):
+        return _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+
+    def _key(self, entry):
+        return self._mm[entry[0]:entry[0] + entry[1]]
+
+    def get(self, key, default=None):
+        """The value bytes stored under `key`, in O(log n)."""
+        target = key.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            k = self._key(entry)
+            if k < target:
+                lo = mid + 1
+            elif k > target:
+                hi = mid
+            else:
+                return self._mm[entry[2]:entry[2] + entry[3]]
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def close(self):
+        self._mm.close()
@@ -0,0 +1,349 @@
+"""Storage backends for the vocabulary table.
+
+Every backend holds the same columns as the VocabApp_DB sheet (COLUMNS) and
+implements the handful of operations the app needs. Pick one with
+`make_backend`.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+COLUMNS = ["Word", "Definition", "POS", "Source", "Date", "Count"]
+
+
+def normalize_word(word):
+    return str(word).lower().strip()
+
+
+def as_count(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 1
+
+
+class StorageBackend:
+    """Interface shared by all backends. Rows are lists in COLUMNS order."""
+
+    def list_records(self):
+        """Every row as a dict keyed by COLUMNS, in insertion order."""
+        raise NotImplementedError
+
+    def tail(self, n):
+        """The last `n` rows, oldest first."""
+        return self.list_records()[-n:]
+
+    def list_scores(self):
+        """[(word, count)] for every row, in insertion order."""
+        return [(r.get("Word", ""), r.get("Count")) for r in self.list_records()]
+
+    def get_rows(self, words):
+        """Full rows for `words`, in the order given; unknown words are skipped."""
+        by_word = {}
+        for r in self.list_records():
+            by_word.setdefault(normalize_word(r.get("Word", "")), r)
+        return [by_word[w] for w in map(normalize_word, words) if w in by_word]
+
+    def version(self):
+        """Cheap token that changes whenever the data changes, or None if
+        the backend cannot tell."""
+        return None
+
+    def exists(self, word):
+        target = normalize_word(word)
+        return any(normalize_word(r.get("Word", "")) == target for r in self.list_records())
+
+    def append(self, row):
+        self.append_rows([row])
+
+    def append_rows(self, rows):
+        raise NotImplementedError
+
+    def update_score(self, word, count):
+        self.update_scores({word: count})
+
+    def update_scores(self, counts):
+        """Set Count for several {word: count} pairs; unknown words are skipped."""
+        raise NotImplementedError
+
+
+# --- GOOGLE SHEETS ---
+COUNT_COL = COLUMNS.index("Count") + 1
+COUNT_COL_LETTER = chr(ord("A") + COUNT_COL - 1)
+LAST_COL_LETTER = chr(ord("A") + len(COLUMNS) - 1)
+# Row 1 holds the headers, so record i lives on sheet row i + 2
+FIRST_DATA_ROW = 2
+# Extra rows read past the known end by tail() to notice outside appends
+TAIL_SLACK = 20
+
+
+def _row_from_range(a1_range):
+    """'Sheet1!A12:F12' -> 12"""
+    match = re.search(r"![A-Z]+(\d+)", a1_range or "")
+    return int(match.group(1)) if match else None
+
+
+class SheetsBackend(StorageBackend):
+    """The VocabApp_DB worksheet, reached through gspread.
+
+    Keeps a normalized word -> sheet row index so score updates need no
+    full reads. The index remembers the spreadsheet version it was built
+    at; it is rebuilt from every bulk read, whenever that version has moved
+    on, and whenever it is found to disagree with the sheet.
+    """
+
+    def __init__(self, get_sheet):
+        self._get_sheet = get_sheet
+        self._lock = threading.Lock()
+        self._rows = None       # normalized word -> sheet row
+        self._row_count = None  # number of data rows
+        self._indexed_version = None
+
+    def _build_index(self, words, version=None):
+        # The first occurrence wins, matching what sheet.find() returned
+        rows = {}
+        for i, w in enumerate(words):
+            rows.setdefault(normalize_word(w), i + FIRST_DATA_ROW)
+        with self._lock:
+            self._rows = rows
+            self._row_count = len(words)
+            self._indexed_version = version
+
+    def _forget_rows(self):
+        with self._lock:
+            self._rows = self._row_count = self._indexed_version = None
+
+    def _probe(self):
+        try:
+            return self.version()
+        except Exception as e:
+            print(f"Sheet version probe failed: {e}")
+            return None
+
+    def _reindex(self, version=None):
+        # Probe before reading so edits made during the read are seen later.
+        # Column A only; cheaper than a full read
+        if version is None:
+            version = self._probe()
+        self._build_index(self._get_sheet().col_values(1)[1:], version)
+
+    def _row_of(self, word):
+        if self._rows is None:
+            self._reindex()
+        return self._rows.get(normalize_word(word))
+
+    def list_records(self):
+        version = self._probe()
+        records = self._get_sheet().get_all_records()
+        self._build_index([r.get("Word", "") for r in records], version)
+        return records
+
+    def exists(self, word):
+        return self._row_of(word) is not None
+
+    def version(self):
+        """The spreadsheet's Drive modifiedTime: one small metadata request.
+
+        Needs gspread 6; the older `lastUpdateTime` property is read once
+        when the spreadsheet is opened and never changes.
+        """
+        return self._get_sheet().spreadsheet.get_lastUpdateTime()
+
+    def list_scores(self):
+        """Word and Count columns only, in one batch_get."""
+        version = self._probe()
+        words, counts = self._get_sheet().batch_get(
+            [f"A{FIRST_DATA_ROW}:A", f"{COUNT_COL_LETTER}{FIRST_DATA_ROW}:{COUNT_COL_LETTER}"],
+            value_render_option="UNFORMATTED_VALUE",
+        )
+        words = [v[0] if v else "" for v in words]
+        counts = [v[0] if v else "" for v in counts]
+        counts += [""] * (len(words) - len(counts))
+        self._build_index(words, version)
+        return [(w, c) for w, c in zip(words, counts) if w]
+
+    def get_rows(self, words):
+        """One batch_get with a single-row range per word."""
+        rows = [(w, self._row_of(w)) for w in words]
+        rows = [(w, r) for w, r in rows if r]
+        if not rows:
+            return []
+        values = self._get_sheet().batch_get(
+            [f"A{r}:{LAST_COL_LETTER}{r}" for _, r in rows],
+            value_render_option="UNFORMATTED_VALUE",
+        )
+        records = []
+        for (word, _), value_range in zip(rows, values):
+            v = value_range[0] if value_range else []
+            # Skip rows that no longer hold the word we indexed
+            if v and normalize_word(v[0]) == normalize_word(word):
+                records.append(dict(zip(COLUMNS, v + [""] * (len(COLUMNS) - len(v)))))
+        return records
+
+    def tail(self, n):
+        """Ranged read of the last `n` rows; cost does not grow with the sheet.
+
+        The range ends TAIL_SLACK rows past the last known row so appends
+        made outside the app still show up. If even the slack is full, or
+        fewer rows come back than expected because rows were deleted
+        elsewhere, the row count is re-read before trying again.
+        """
+        for attempt in range(2):
+            if self._row_count is None or attempt:
+                self._reindex()
+            last_row = self._row_count + FIRST_DATA_ROW - 1
+            first_row = max(FIRST_DATA_ROW, last_row - n + 1)
+            expected = last_row - first_row + 1
+            values = self._get_sheet().get(
+                f"A{first_row}:{LAST_COL_LETTER}{last_row + TAIL_SLACK}",
+                value_render_option="UNFORMATTED_VALUE",
+            )
+            if len(values) != expected:
+                # Rows were added or deleted elsewhere; row numbers need refreshing
+                self._forget_rows()
+            if expected <= len(values) < expected + TAIL_SLACK:
+                break
+        rows = [v + [""] * (len(COLUMNS) - len(v)) for v in values if any(v)]
+        return [dict(zip(COLUMNS, v)) for v in rows[-n:]]
+
+    def append_rows(self, rows):
+        """All rows in a single append_rows call."""
+        if not rows:
+            return
+        response = self._get_sheet().append_rows(rows)
+        written_row = _row_from_range((response or {}).get("updates", {}).get("updatedRange"))
+        with self._lock:
+            if self._rows is None:
+                return
+            expected_row = self._row_count + FIRST_DATA_ROW
+            if written_row is not None and written_row != expected_row:
+                # Rows were added or removed outside the app
+                self._rows = self._row_count = None
+                return
+            for i, row in enumerate(rows):
+                self._rows.setdefault(normalize_word(row[0]), expected_row + i)
+            self._row_count += len(rows)
+
+    def update_scores(self, counts):
+        """One version probe and one batch_update while the index is current.
+
+        Sheets accepts a write to any row in the grid, so after rows are
+        deleted or reordered elsewhere a stale index would put counts on the
+        wrong words. If the spreadsheet version differs from the one the
+        index was built at (or cannot be read), the index is rebuilt from
+        column A before writing. Words it does not hold are skipped.
+
+        Our own write moves the version too; it is adopted afterwards, so
+        the next flush needs no rebuild. An outside edit landing between the
+        probe and the write is missed until the next bulk read.
+        """
+        version = self._probe()
+        if version is None or version != self._indexed_version or self._rows is None:
+            self._reindex(version)
+        updates = []
+        for word, count in counts.items():
+            row = self._row_of(word)
+            if row:
+                updates.append({"range": f"{COUNT_COL_LETTER}{row}", "values": [[count]]})
+        if not updates:
+            return
+        self._get_sheet().batch_update(updates)
+        if version is not None:
+            new_version = self._probe()
+            with self._lock:
+                if self._indexed_version == version:
+                    self._indexed_version = new_version
+
+
+# --- SQLITE ---
+class SQLiteBackend(StorageBackend):
+    """A local SQLite file with the sheet's columns and an index on Word."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS vocab (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    word TEXT NOT NULL,
+                    word_norm TEXT NOT NULL,
+                    definition TEXT,
+                    pos TEXT,
+                    source TEXT,
+                    date TEXT,
+                    count INTEGER NOT NULL DEFAULT 1
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_vocab_word_norm ON vocab (word_norm)")
+            # Bumped by triggers, so writes from other processes count too
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (version INTEGER NOT NULL)")
+            if not self._conn.execute("SELECT 1 FROM meta").fetchone():
+                self._conn.execute("INSERT INTO meta (version) VALUES (0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                self._conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS vocab_version_{event.lower()}
+                    AFTER {event} ON vocab
+                    BEGIN UPDATE meta SET version = version + 1; END""")
+
+    _SELECT = "SELECT word, definition, pos, source, date, count FROM vocab"
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def list_records(self):
+        return [dict(zip(COLUMNS, r)) for r in self._query(f"{self._SELECT} ORDER BY id")]
+
+    def tail(self, n):
+        rows = self._query(f"{self._SELECT} ORDER BY id DESC LIMIT ?", (n,))
+        return [dict(zip(COLUMNS, r)) for r in reversed(rows)]
+
+    def list_scores(self):
+        return self._query("SELECT word, count FROM vocab ORDER BY id")
+
+    def get_rows(self, words):
+        norms = [normalize_word(w) for w in words]
+        placeholders = ", ".join("?" * len(norms))
+        rows = self._query(f"{self._SELECT} WHERE word_norm IN ({placeholders}) ORDER BY id", norms)
+        by_word = {}
+        for r in rows:
+            by_word.setdefault(normalize_word(r[0]), dict(zip(COLUMNS, r)))
+        return [by_word[w] for w in norms if w in by_word]
+
+    def version(self):
+        return self._query("SELECT version FROM meta")[0][0]
+
+    def exists(self, word):
+        return bool(self._query("SELECT 1 FROM vocab WHERE word_norm = ? LIMIT 1", (normalize_word(word),)))
+
+    def append_rows(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO vocab (word, word_norm, definition, pos, source, date, count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(word, normalize_word(word), definition, pos, source, date, as_count(count))
+                 for word, definition, pos, source, date, count in rows],
+            )
+
+    def update_scores(self, counts):
+        # Like the sheet index, a duplicated word's count lives on its first row
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE vocab SET count = ? WHERE id = (SELECT MIN(id) FROM vocab WHERE word_norm = ?)",
+                [(as_count(c), normalize_word(w)) for w, c in counts.items()],
+            )
+
+
+def make_backend(kind, get_sheet=None, sqlite_path=None):
+    """Build the backend named by config: "sheets" (default) or "sqlite"."""
+    kind = (kind or "sheets").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(sqlite_path)
+    if kind == "sheets":
+        return SheetsBackend(get_sheet)
+    raise ValueError(f"Unknown storage backend: {kind}")
@@ -0,0 +1,236 @@
+"""Shared, in-process snapshot of the vocabulary table."""
+import heapq
+import threading
+import time
+
+import metrics
+from storage import COLUMNS, as_count, normalize_word
+
+
+class VocabStore:
+    """Cross-session cache of the vocabulary rows.
+
+    Reads are served from memory. Writes made through the store go to the
+    backend first and are then applied to the snapshot, so this app never
+    has to re-download what it just wrote.
+
+    Outside edits are noticed with the backend's cheap version() probe,
+    made at most once every `probe_interval` seconds; the snapshot is only
+    reloaded when the version changes. Regardless of the probe it is never
+    kept longer than `ttl` seconds, which also covers backends without a
+    version and failing probes.
+
+    `root_fn(word)` returns a word's lemma (or None); it lets duplicate
+    checks treat "running" and "Run" as the same entry.
+    """
+
+    def __init__(self, backend, ttl=300, root_fn=None, probe_interval=15):
+        self.backend = backend
+        self.ttl = ttl
+        self.probe_interval = probe_interval
+        self._root_fn = root_fn
+        self._lock = threading.RLock()
+        self._records = None
+        self._index = {}
+        self._roots = {}
+        self._loaded_at = 0.0
+        self._version = None
+        self._probed_at = 0.0
+        self._refresh_hooks = []
+
+    # --- SNAPSHOT ---
+    def _is_stale(self):
+        if self._records is None:
+            return True
+        now = time.time()
+        if now - self._loaded_at > self.ttl:
+            return True
+        if now - self._probed_at < self.probe_interval:
+            return False
+        self._probed_at = now
+        version = self._probe()
+        return version is not None and version != self._version
+
+    def _probe(self):
+        try:
+            metrics.incr("store.version_probes")
+            return self.backend.version()
+        except Exception as e:
+            print(f"Version probe failed: {e}")
+            return None
+
+    def _version_before_write(self):
+        with self._lock:
+            if self._records is None or self._version is None:
+                return None
+        return self._probe()
+
+    def _adopt_version(self, before):
+        # Our own writes bump the version too; take the new value so they
+        # don't trigger a reload, but only if nothing else changed since the
+        # snapshot was taken. Otherwise probe again on the next read so the
+        # outside edit is loaded. An edit landing during the write itself is
+        # caught by the ttl fallback at the latest.
+        with self._lock:
+            if self._records is None or before is None:
+                return
+            if before == self._version:
+                self._version = self._probe()
+                self._probed_at = time.time()
+            else:
+                self._probed_at = 0.0
+
+    def refresh(self):
+        with self._lock:
+            metrics.incr("store.refreshes")
+            # Probe before reading so edits made during the read are seen later
+            self._version = self._probe()
+            self._probed_at = time.time()
+            self._records = self.backend.list_records()
+            self._build_index()
+            self._loaded_at = time.time()
+            for hook in self._refresh_hooks:
+                hook()
+            return self._records
+
+    def add_refresh_hook(self, hook):
+        """Call `hook()` after every snapshot reload."""
+        self._refresh_hooks.append(hook)
+
+    def _build_index(self):
+        # Normalized word -> position in self._records; first occurrence wins
+        self._index = {}
+        self._roots = {}
+        for i, r in enumerate(self._records):
+            self._add_to_index(r.get("Word", ""), i)
+
+    def _add_to_index(self, word, i):
+        norm = normalize_word(word)
+        self._index.setdefault(norm, i)
+        root = self._root(norm)
+        if root:
+            self._roots.setdefault(root, i)
+
+    def _root(self, norm):
+        if not self._root_fn or not norm:
+            return None
+        root = self._root_fn(norm)
+        return normalize_word(root) if root else None
+
+    def reindex(self):
+        """Rebuild the indexes in place, e.g. once root_fn can answer."""
+        with self._lock:
+            if self._records is not None:
+                self._build_index()
+
+    def invalidate(self):
+        with self._lock:
+            self._records = None
+
+    def _snapshot(self):
+        with self._lock:
+            if self._is_stale():
+                self.refresh()
+            return self._records
+
+    def records(self):
+        """Copies of every row, safe for callers to mutate."""
+        with self._lock:
+            return [dict(r) for r in self._snapshot()]
+
+    def tail(self, n):
+        """The last `n` rows, oldest first.
+
+        Served from the snapshot, which is reloaded first if it is out of
+        date. Before anything has loaded it, the rows are read straight from
+        the backend instead of loading everything.
+        """
+        with self._lock:
+            if self._records is not None:
+                return [dict(r) for r in self._snapshot()[-n:]]
+        return self.backend.tail(n)
+
+    def contains(self, word):
+        with self._lock:
+            self._snapshot()
+            return normalize_word(word) in self._index
+
+    def find_duplicate(self, word):
+        """The saved word that `word` duplicates, or None.
+
+        Matches case-insensitively, then by lemma in both directions: saving
+        "running" finds a saved "Run", and saving "run" finds "Running".
+        """
+        norm = normalize_word(word)
+        with self._lock:
+            records = self._snapshot()
+            i = self._index.get(norm)
+            if i is None:
+                root = self._root(norm)
+                i = self._index.get(root) if root else None
+                if i is None:
+                    i = self._roots.get(root or norm)
+            return None if i is None else records[i].get("Word")
+
+    def count(self, word):
+        """Current Count for a saved word, or None if it is not saved."""
+        with self._lock:
+            records = self._snapshot()
+            i = self._index.get(normalize_word(word))
+            return None if i is None else as_count(records[i].get("Count"))
+
+    def practice_batch(self, n):
+        """The `n` rows with the lowest Count (earliest rows win ties).
+
+        Uses the snapshot (reloaded first if out of date) once one has been
+        loaded. Before that only the Word and Count columns are read, and
+        full rows are fetched for the chosen words.
+        """
+        with self._lock:
+            if self._records is not None:
+                records = self._snapshot()
+                chosen = heapq.nsmallest(
+                    n, range(len(records)),
+                    key=lambda i: (as_count(records[i].get("Count")), i))
+                rows = [dict(records[i]) for i in chosen]
+            else:
+                rows = None
+        if rows is None:
+            scores = self.backend.list_scores()
+            chosen = heapq.nsmallest(n, range(len(scores)), key=lambda i: (as_count(scores[i][1]), i))
+            rows = self.backend.get_rows([scores[i][0] for i in chosen])
+        for r in rows:
+            r["Count"] = as_count(r.get("Count"))
+        return rows
+
+    # --- WRITE-THROUGH ---
+    def append(self, row):
+        """Append a row (in COLUMNS order) to the backend and the snapshot."""
+        self.append_rows([row])
+
+    def append_rows(self, rows):
+        """Append many rows with a single backend write."""
+        before = self._version_before_write()
+        self.backend.append_rows(rows)
+        with self._lock:
+            if self._records is None:
+                return
+            for row in rows:
+                self._records.append(dict(zip(COLUMNS, row)))
+                self._add_to_index(row[0], len(self._records) - 1)
+        self._adopt_version(before)
+
+    def write_counts(self, counts):
+        """Persist several {word: count} updates in one backend call."""
+        before = self._version_before_write()
+        self.backend.update_scores(counts)
+        for word, count in counts.items():
+            self.set_count(word, count)
+        self._adopt_version(before)
+
+    def set_count(self, word, count):
+        """Record a Count in the snapshot only."""
+        with self._lock:
+            i = self._index.get(normalize_word(word))
+            if self._records is not None and i is not None:
+                self._records[i]["Count"] = count
@@ -0,0 +1,98 @@
+"""Precomputed WordNet synonym lists.
+
+Maps every WordNet lemma to its top synonyms, ranked by nlp.rank_synonyms,
+in a memory-mapped string table (see sstable.py). Lookups are a binary
+search with no WordNet traversal, the order never changes between runs,
+and worker processes share the file's pages read-only. Like the offline
+dictionary it is built once in the background when missing, or ahead of
+time with:
+
+    python synonym_index.py build [path]
+"""
+import os
+import sys
+import threading
+
+import metrics
+import nlp
+from sstable import SSTable, write_table
+
+FILE_NAME = "synonyms.v1.sst"
+DEFAULT_PATH = os.path.join(".vocab_cache", FILE_NAME)
+# Synonyms are stored newline-separated; lemmas without any map to b""
+SEPARATOR = "\n"
+
+
+def build(path=DEFAULT_PATH, k=nlp.MAX_SYNONYMS):
+    from nltk.corpus import wordnet
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    names = {n.lower() for n in wordnet.all_lemma_names()}
+    write_table(path, ((n.replace('_', ' '), SEPARATOR.join(nlp.rank_synonyms(n, k)).encode("utf-8"))
+                       for n in names))
+
+
+class SynonymIndex:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._table = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._building = False
+
+    def _open(self):
+        with self._lock:
+            if self._table is not None:
+                return self._table
+            if os.path.exists(self.path):
+                self._table = SSTable(self.path)
+                return self._table
+            if not self._building:
+                self._building = True
+                threading.Thread(target=self._build, name="synonym-index-build", daemon=True).start()
+            return None
+
+    def _build(self):
+        try:
+            self.ensure_built()
+        except Exception as e:
+            print(f"Synonym index build failed: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def ensure_built(self):
+        """Build the index in the calling thread if it is missing.
+
+        Safe to call from several threads; later callers wait for the
+        first build instead of starting their own.
+        """
+        with self._build_lock:
+            if not os.path.exists(self.path):
+                nlp.ensure_loaded()
+                with nlp.BUILD_LOCK:
+                    build(self.path)
+
+    def ready(self):
+        return self._open() is not None
+
+    def get(self, word):
+        """Ranked synonyms of a WordNet lemma, or None if the index cannot
+        answer (not built yet, or `word` is not a lemma)."""
+        table = self._open()
+        if table is None:
+            return None
+        raw = table.get(word.lower().strip().replace('_', ' '))
+        if raw is None:
+            metrics.incr("synonym_index.misses")
+            return None
+        metrics.incr("synonym_index.hits")
+        return raw.decode("utf-8").split(SEPARATOR) if raw else []
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python synonym_index.py build [path]")
+    build(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH)
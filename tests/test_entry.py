@@ -0,0 +1,50 @@
+import pytest
+
+import entry
+from entry import Entry, Suggestions
+
+
+def test_entry_round_trips_through_compact_form():
+    original = Entry("run", [("verb", ["to go fast", "to operate"]), ("noun", [])],
+                     root="run", synonyms=["sprint", "dash"], source="Merriam-Webster")
+
+    for copy in (entry.from_compact(original.to_compact()), entry.loads(entry.dumps(original))):
+        assert isinstance(copy, Entry)
+        assert copy.headword == "run"
+        assert copy.senses == (("verb", ("to go fast", "to operate")), ("noun", ()))
+        assert copy.root == "run"
+        assert copy.synonyms == ("sprint", "dash")
+        assert copy.source == "Merriam-Webster"
+        assert copy.to_compact() == original.to_compact()
+
+
+def test_entry_defaults_round_trip():
+    copy = entry.loads(entry.dumps(Entry("café")))
+
+    assert copy.headword == "café"
+    assert copy.senses == ()
+    assert copy.root is None
+    assert copy.synonyms == ()
+    assert copy.source is None
+
+
+def test_suggestions_and_none_round_trip():
+    suggestions = entry.loads(entry.dumps(Suggestions(["serenity", "serendipitous"], source="Local speller")))
+
+    assert isinstance(suggestions, Suggestions)
+    assert suggestions.words == ("serenity", "serendipitous")
+    assert suggestions.source == "Local speller"
+    assert entry.loads(entry.dumps(None)) is None
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        entry.from_compact(["x", "word"])
+
+
+def test_definition_lines_skip_empty_parts_of_speech():
+    e = Entry("run", [("verb", ["to go fast", "to operate"]), ("noun", [])])
+
+    assert e.definition_lines() == ["(verb) 1. to go fast; 2. to operate"]
+    assert e.to_row("MW", "2024-01-01") == ["Run", "(verb) 1. to go fast; 2. to operate", "verb, noun",
+                                            "MW", "2024-01-01", 1]
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import metrics
+from hedge import Hedger
+
+
+def warmed_hedger(name, latency=0.01, samples=20):
+    """A hedger that has seen `samples` calls taking about `latency` seconds."""
+    hedger = Hedger(name, min_samples=samples, min_delay=0.01)
+    for _ in range(samples):
+        hedger.call(time.sleep, latency)
+    return hedger
+
+
+def test_no_delay_until_enough_samples():
+    hedger = Hedger("test_hedge_samples", min_samples=3, min_delay=0.05)
+    assert hedger.delay() is None
+
+    for _ in range(3):
+        hedger.call(lambda: None)
+
+    # Fast calls are floored at min_delay
+    assert hedger.delay() == 0.05
+    assert metrics.get("test_hedge_samples.hedges") == 0
+
+
+def test_delay_tracks_the_percentile():
+    hedger = warmed_hedger("test_hedge_delay", latency=0.02)
+
+    assert 0.02 <= hedger.delay() < 0.2
+
+
+def test_backup_wins_when_the_primary_is_slow():
+    hedger = warmed_hedger("test_hedge_wins")
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(5)  # the primary hangs
+            return "primary"
+        return "backup"
+
+    try:
+        assert hedger.call(fetch) == "backup"
+    finally:
+        release.set()
+    assert metrics.get("test_hedge_wins.hedges") == 1
+    assert metrics.get("test_hedge_wins.hedge_wins") == 1
+
+
+def test_before_hedge_failure_skips_the_backup():
+    hedger = warmed_hedger("test_hedge_skipped")
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        time.sleep(0.2)
+        return "primary"
+
+    def refuse():
+        raise RuntimeError("no quota")
+
+    assert hedger.call(fetch, before_hedge=refuse) == "primary"
+    assert len(calls) == 1
+    assert metrics.get("test_hedge_skipped.hedges_skipped") == 1
+
+
+def test_both_failing_reports_the_primary_error():
+    hedger = warmed_hedger("test_hedge_fail")
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        attempt = len(calls)
+        time.sleep(0.2 if attempt == 1 else 0)
+        raise ValueError(f"attempt {attempt}")
+
+    with pytest.raises(ValueError, match="attempt 1"):
+        hedger.call(fetch)
+    assert len(calls) == 2
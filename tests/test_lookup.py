@@ -0,0 +1,201 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("nltk")
+
+from entry import Entry, Suggestions
+from lookup import LookupEngine
+from mw_cache import LookupCache
+from mw_quota import DailyQuota
+
+
+class FakeOffline:
+    def __init__(self, entries):
+        self.entries = entries
+        self.queries = []
+
+    def lookup(self, query):
+        self.queries.append(query)
+        return self.entries.get(query)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+
+    def json(self):
+        return self.payload
+
+
+class FakeHttp:
+    def __init__(self, payload=()):
+        self.payload = list(payload)
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return FakeResponse(self.payload)
+
+
+@pytest.fixture
+def low_quota(tmp_path):
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=10, reserve=10)
+    assert quota.is_low()
+    return quota
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LookupCache(str(tmp_path / "cache.sqlite3"))
+
+
+def test_saving_quota_serves_uncached_word_from_offline(cache, low_quota):
+    offline_entry = Entry("serendipity", [("noun", ["a happy accident"])], source="offline")
+    offline = FakeOffline({"serendipity": offline_entry})
+    http = FakeHttp()
+    engine = LookupEngine("key", cache=cache, offline=offline, quota=low_quota, http=http)
+
+    assert engine.lookup("serendipity", check_spelling=False) is offline_entry
+    assert offline.queries == ["serendipity"]
+    assert http.urls == []
+
+
+def test_saving_quota_prefers_cached_entry(cache, low_quota):
+    cached_entry = Entry("serendipity", [("noun", ["luck"])], source="Merriam-Webster")
+    cache.set("serendipity", cached_entry)
+    offline = FakeOffline({})
+    engine = LookupEngine("key", cache=cache, offline=offline, quota=low_quota, http=FakeHttp())
+
+    result = engine.lookup("serendipity", check_spelling=False)
+
+    assert isinstance(result, Entry)
+    assert result.to_compact() == cached_entry.to_compact()
+    assert offline.queries == []
+
+
+def test_saving_quota_calls_mw_only_when_nothing_local_knows(cache, tmp_path):
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=10, reserve=10)
+    http = FakeHttp(["serenity", "serendipitous"])
+    engine = LookupEngine("key", cache=cache, offline=FakeOffline({}), quota=quota, http=http)
+
+    result = engine.lookup("serendipityy", check_spelling=False)
+
+    assert isinstance(result, Suggestions)
+    assert list(result.words) == ["serenity", "serendipitous"]
+    assert len(http.urls) == 1
+    assert quota.used("lookup") == 1
+
+
+class FlakyHttp(FakeHttp):
+    """Answers 503 to the first `failures` requests."""
+
+    def __init__(self, payload, failures):
+        super().__init__(payload)
+        self.failures = failures
+
+    def get(self, url):
+        self.urls.append(url)
+        if len(self.urls) <= self.failures:
+            return FakeResponse(None, status_code=503)
+        return FakeResponse(self.payload)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    import lookup
+
+    monkeypatch.setattr(lookup, "MW_RETRY_BACKOFF", 0)
+
+
+def test_retries_count_against_the_quota(cache, tmp_path, no_backoff):
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=100, reserve=0)
+    http = FlakyHttp([{"meta": {"id": "run"}, "hwi": {"hw": "run"}, "fl": "verb", "shortdef": ["to go"]}],
+                     failures=2)
+    engine = LookupEngine("key", cache=cache, quota=quota, http=http)
+
+    assert isinstance(engine.lookup("run", check_spelling=False), Entry)
+    assert len(http.urls) == 3
+    assert quota.used("lookup") == 3
+
+
+def test_retry_is_not_sent_once_the_quota_is_used_up(cache, tmp_path, no_backoff):
+    from mw_quota import QuotaExceededError
+
+    quota = DailyQuota(str(tmp_path / "quota.sqlite3"), daily_limit=1, reserve=0)
+    http = FlakyHttp(["run"], failures=5)
+    engine = LookupEngine("key", cache=cache, quota=quota, http=http)
+
+    with pytest.raises(QuotaExceededError):
+        engine.lookup("run", check_spelling=False)
+    assert len(http.urls) == 1
+    assert quota.used() == 1
+
+
+class EagerSpeller:
+    """Offers a correction for anything, like a real word missing from WordNet."""
+
+    def confident_suggestions(self, query):
+        return ["bog", "clog", "log"]
+
+
+def test_lookup_many_skips_the_local_speller(cache):
+    http = FakeHttp([{"meta": {"id": "blog"}, "hwi": {"hw": "blog"}, "fl": "noun",
+                      "shortdef": ["a website of posts"]}])
+    engine = LookupEngine("key", cache=cache, http=http, speller=EagerSpeller())
+
+    [result] = engine.lookup_many(["blog"])
+
+    assert result.error is None
+    assert isinstance(result.data, Entry)
+    assert result.data.definition_lines() == ["(noun) 1. a website of posts"]
+    assert len(http.urls) == 1
+
+
+@pytest.mark.parametrize("state, cached", [("loading", False), ("failed", True), ("ready", True)])
+def test_entries_are_cached_unless_wordnet_is_still_loading(cache, monkeypatch, state, cached):
+    import nlp
+
+    monkeypatch.setattr(nlp.warmup, "state", state)
+    http = FakeHttp([{"meta": {"id": "run"}, "hwi": {"hw": "run"}, "fl": "verb", "shortdef": ["to go fast"]}])
+    engine = LookupEngine("key", cache=cache, http=http)
+
+    engine.lookup("run", check_spelling=False)
+    engine.lookup("run", check_spelling=False)
+
+    assert len(http.urls) == (1 if cached else 2)
+    assert len(cache) == (1 if cached else 0)
+
+
+def test_lookup_many_waits_for_wordnet_off_the_event_loop(cache, monkeypatch):
+    import asyncio
+    import threading
+
+    import lookup
+    import nlp
+
+    loop_threads, waits = [], []
+
+    def fake_ensure_loaded(timeout=None):
+        waits.append((threading.current_thread(), timeout))
+        return False
+
+    monkeypatch.setattr(nlp, "ensure_loaded", fake_ensure_loaded)
+    http = FakeHttp([{"meta": {"id": "run"}, "hwi": {"hw": "run"}, "fl": "verb", "shortdef": ["to go"]}])
+    engine = LookupEngine("key", cache=cache, http=http)
+
+    async def run():
+        loop_threads.append(threading.current_thread())
+        return await engine.lookup_many_async(["run"])
+
+    [result] = asyncio.run(run())
+
+    assert isinstance(result.data, Entry)
+    assert len(waits) == 1
+    wait_thread, timeout = waits[0]
+    assert wait_thread is not loop_threads[0]
+    assert timeout == lookup.WARMUP_WAIT
@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+import entry
+from entry import Entry, Suggestions
+from mw_cache import MISS, LookupCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    import mw_cache
+
+    clock = FakeClock()
+    monkeypatch.setattr(mw_cache.time, "time", clock.time)
+    return clock
+
+
+def make_entry(word):
+    return Entry(word, [("noun", [f"def of {word}"])], source="Merriam-Webster")
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"), ttl=100, negative_ttl=10)
+    cache.set("Alpha", make_entry("alpha"))
+    cache.set("alphx", Suggestions(["alpha"]))
+    cache.set("qzx", None)
+
+    clock.now += 11
+    assert cache.get("alpha").headword == "alpha"
+    assert cache.get("alphx") is MISS
+    assert not cache.contains("qzx")
+    assert cache.get("qzx") is MISS
+
+    clock.now += 90
+    assert cache.peek("alpha") is MISS
+    assert cache.get("alpha") is MISS
+    assert len(cache) == 0
+
+
+def test_none_is_cached_as_not_found(tmp_path, clock):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("qzx", None)
+
+    assert cache.get("qzx") is None
+    assert cache.get("other") is MISS
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("alpha", make_entry("alpha"))
+    clock.now += 1
+    cache.set("beta", make_entry("beta"))
+    clock.now += 1
+    cache.get("alpha")  # alpha is now more recent than beta
+    clock.now += 1
+    cache.set("gamma", make_entry("gamma"))
+
+    assert len(cache) == 2
+    assert cache.contains("alpha")
+    assert not cache.contains("beta")
+    assert cache.contains("gamma")
+
+
+def test_peek_does_not_refresh_recency(tmp_path, clock):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("alpha", make_entry("alpha"))
+    clock.now += 1
+    cache.set("beta", make_entry("beta"))
+    clock.now += 1
+    cache.peek("alpha")
+    clock.now += 1
+    cache.set("gamma", make_entry("gamma"))
+
+    assert not cache.contains("alpha")
+    assert cache.contains("beta")
+
+
+def test_entries_from_an_older_format_are_dropped(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    LookupCache(path).set("alpha", make_entry("alpha"))
+    assert len(LookupCache(path)) == 1
+
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {entry.FORMAT_VERSION - 1}")
+    conn.commit()
+    conn.close()
+
+    cache = LookupCache(path)
+    assert len(cache) == 0
+    assert cache.get("alpha") is MISS
@@ -0,0 +1,46 @@
+import threading
+import time
+
+from score_queue import ScoreQueue
+
+
+class BlockingStore:
+    """Holds the first write until released, records every batch."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.first_write_started = threading.Event()
+        self.batches = []
+        self.second_write = threading.Event()
+
+    def add_refresh_hook(self, hook):
+        pass
+
+    def set_count(self, word, count):
+        pass
+
+    def write_counts(self, counts):
+        first = not self.first_write_started.is_set()
+        if first:
+            self.first_write_started.set()
+            self.release.wait(5)
+        self.batches.append(dict(counts))
+        if not first:
+            self.second_write.set()
+
+
+def test_flush_requested_during_a_flush_runs_right_after(tmp_path):
+    store = BlockingStore()
+    queue = ScoreQueue(store, str(tmp_path / "journal.json"), flush_every=1, flush_interval=30)
+
+    queue.record("Alpha", 2)
+    assert store.first_write_started.wait(5)
+    queue.record("Beta", 3)
+    store.release.set()
+
+    assert store.second_write.wait(5)
+    assert store.batches[-1] == {"Beta": 3}
+    deadline = time.time() + 5
+    while queue.status()["pending"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.status()["pending"] == 0
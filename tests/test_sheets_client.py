@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("gspread")
+
+import sheets_client
+from sheets_client import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sheets_client.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(sheets_client.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_never_exceeds_rate_in_any_minute(clock):
+    bucket = TokenBucket(60)
+    granted = []
+    for _ in range(200):
+        bucket.acquire()
+        granted.append(clock.now)
+
+    for i, start in enumerate(granted):
+        in_window = [t for t in granted[i:] if t < start + 60]
+        assert len(in_window) <= 60
+
+
+def test_first_minute_allows_only_the_quota_even_with_a_large_burst(clock):
+    bucket = TokenBucket(60, capacity=60)
+    start = clock.now
+    granted = 0
+    while True:
+        bucket.acquire()
+        if clock.now >= start + 60:
+            break
+        granted += 1
+    assert granted == 60
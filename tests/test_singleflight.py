@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+import metrics
+from singleflight import SingleFlight
+
+
+def run_waiters(flight, key, fn, n):
+    """Start `n` threads calling flight.do(key, fn); returns (threads, outcomes)."""
+    outcomes = []
+
+    def waiter():
+        try:
+            outcomes.append(("ok", flight.do(key, fn)))
+        except Exception as e:
+            outcomes.append(("error", e))
+
+    threads = [threading.Thread(target=waiter) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, outcomes
+
+
+def wait_for_followers(flight, n):
+    """Block until `n` callers are waiting on an in-flight call."""
+    deadline = time.monotonic() + 5
+    while metrics.get(f"{flight.name}.coalesced") < n and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test_singleflight_share")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(None)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    threads, outcomes = run_waiters(flight, "word", fn, 5)
+    started.wait(5)
+    wait_for_followers(flight, 4)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert outcomes == [("ok", "result")] * 5
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight("test_singleflight_error")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(None)
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, outcomes = run_waiters(flight, "word", fn, 4)
+    started.wait(5)
+    wait_for_followers(flight, 3)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert len(outcomes) == 4
+    assert all(kind == "error" and str(e) == "boom" for kind, e in outcomes)
+
+
+def test_next_call_runs_again_after_an_error():
+    flight = SingleFlight("test_singleflight_retry")
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("word", fail)
+    assert flight.do("word", lambda: "fresh") == "fresh"
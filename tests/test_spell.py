@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("nltk")
+
+from spell import FUNCTION_WORD_FREQUENCY, FUNCTION_WORDS, SpellSuggester
+
+
+@pytest.fixture
+def speller():
+    speller = SpellSuggester()
+    for word in ("heir", "wit", "becalms", "thin"):
+        speller.add(word, 10)
+    for word in FUNCTION_WORDS:
+        speller.add(word, FUNCTION_WORD_FREQUENCY)
+    speller._ready.set()
+    return speller
+
+
+@pytest.mark.parametrize("word", ["their", "with", "because", "Then"])
+def test_function_words_are_not_corrected(speller, word):
+    assert speller.confident_suggestions(word) is None
+
+
+def test_misspelled_function_word_is_corrected(speller):
+    assert speller.confident_suggestions("thier")[0] == "their"
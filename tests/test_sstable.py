@@ -0,0 +1,50 @@
+import pytest
+
+from sstable import SSTable, write_table
+
+
+def open_table(tmp_path, items):
+    path = str(tmp_path / "table.sst")
+    write_table(path, items)
+    return SSTable(path)
+
+
+def test_every_key_is_found_by_binary_search(tmp_path):
+    items = {f"word{i:04d}": f"value {i}".encode() for i in range(0, 1000, 3)}
+    table = open_table(tmp_path, items)
+
+    assert len(table) == len(items)
+    for key, value in items.items():
+        assert table.get(key) == value
+    for missing in ("word0001", "word9999", "a", "zzz", ""):
+        assert table.get(missing) is None
+        assert missing not in table
+
+
+def test_empty_table(tmp_path):
+    table = open_table(tmp_path, {})
+
+    assert len(table) == 0
+    assert table.get("anything", b"default") == b"default"
+    assert "anything" not in table
+
+
+def test_non_ascii_keys_and_empty_values(tmp_path):
+    items = {"café": "coffee".encode(), "naïve": b"", "über": "über alles".encode(), "cafe": b"plain"}
+    table = open_table(tmp_path, items)
+
+    assert table.get("café") == b"coffee"
+    assert table.get("cafe") == b"plain"
+    assert table.get("über").decode("utf-8") == "über alles"
+    # An empty value is still a hit
+    assert table.get("naïve") == b""
+    assert "naïve" in table
+    assert table.get("uber") is None
+
+
+def test_rejects_files_that_are_not_tables(tmp_path):
+    path = tmp_path / "other.sst"
+    path.write_bytes(b"not a table at all")
+
+    with pytest.raises(ValueError):
+        SSTable(str(path))
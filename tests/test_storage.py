@@ -0,0 +1,132 @@
+import re
+
+from storage import COLUMNS, SheetsBackend, SQLiteBackend
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.version = 0
+
+    def get_lastUpdateTime(self):
+        return str(self.version)
+
+
+class FakeSheet:
+    """Enough of a gspread worksheet for SheetsBackend, with a header row."""
+
+    def __init__(self, words):
+        self.spreadsheet = FakeSpreadsheet()
+        self.rows = [list(COLUMNS)] + [[w, f"def of {w}", "noun", "Test", "2024-01-01", 1] for w in words]
+
+    def _edited(self):
+        self.spreadsheet.version += 1
+
+    # --- reads ---
+    def get_all_records(self):
+        return [dict(zip(COLUMNS, r)) for r in self.rows[1:]]
+
+    def col_values(self, col):
+        return [r[col - 1] for r in self.rows]
+
+    def get(self, a1_range, **kwargs):
+        first, last = map(int, re.findall(r"\d+", a1_range))
+        return [list(r) for r in self.rows[first - 1:last]]
+
+    def batch_get(self, ranges, **kwargs):
+        return [self.get(r) for r in ranges]
+
+    # --- writes ---
+    def append_rows(self, rows):
+        start = len(self.rows) + 1
+        self.rows.extend(list(r) for r in rows)
+        self._edited()
+        return {"updates": {"updatedRange": f"Sheet1!A{start}:F{len(self.rows)}"}}
+
+    def batch_update(self, updates):
+        for u in updates:
+            row = int(re.search(r"\d+", u["range"]).group())
+            while len(self.rows) < row:
+                self.rows.append([""] * len(COLUMNS))
+            self.rows[row - 1][COLUMNS.index("Count")] = u["values"][0][0]
+        self._edited()
+
+    # --- outside edits ---
+    def delete_row(self, word):
+        self.rows = [r for r in self.rows if r[0] != word]
+        self._edited()
+
+    def count_of(self, word):
+        return next(r[COLUMNS.index("Count")] for r in self.rows if r[0] == word)
+
+
+def make_backend(words):
+    sheet = FakeSheet(words)
+    return sheet, SheetsBackend(lambda: sheet)
+
+
+def test_update_scores_follows_outside_deletion():
+    sheet, backend = make_backend(["Alpha", "Beta", "Gamma"])
+    backend.list_records()
+
+    sheet.delete_row("Alpha")
+    backend.update_scores({"Beta": 7})
+
+    assert sheet.count_of("Beta") == 7
+    assert sheet.count_of("Gamma") == 1
+
+
+def test_update_scores_follows_outside_reorder():
+    sheet, backend = make_backend(["Alpha", "Beta"])
+    backend.list_records()
+
+    sheet.rows[1], sheet.rows[2] = sheet.rows[2], sheet.rows[1]
+    sheet._edited()
+    backend.update_scores({"Alpha": 3})
+
+    assert sheet.count_of("Alpha") == 3
+    assert sheet.count_of("Beta") == 1
+
+
+def test_update_scores_needs_no_rebuild_after_own_write():
+    sheet, backend = make_backend(["Alpha", "Beta"])
+    backend.list_records()
+    backend.update_scores({"Alpha": 2})
+
+    reads = []
+    sheet.col_values = lambda col: reads.append(col) or FakeSheet.col_values(sheet, col)
+    backend.update_scores({"Beta": 5})
+
+    assert reads == []
+    assert sheet.count_of("Beta") == 5
+
+
+def test_tail_follows_outside_deletions():
+    sheet, backend = make_backend([f"Word{i}" for i in range(30)])
+    backend.list_records()
+
+    for i in range(24):
+        sheet.delete_row(f"Word{i}")
+
+    assert [r["Word"] for r in backend.tail(3)] == ["Word27", "Word28", "Word29"]
+
+
+def test_tail_sees_outside_appends():
+    sheet, backend = make_backend(["Alpha", "Beta"])
+    backend.list_records()
+
+    sheet.append_rows([["Gamma", "", "", "", "", 1]])
+
+    assert [r["Word"] for r in backend.tail(2)] == ["Beta", "Gamma"]
+
+
+def test_sqlite_update_scores_sets_only_the_first_duplicate(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "vocab.sqlite3"))
+    backend.append_rows([
+        ["Alpha", "first", "noun", "Test", "2024-01-01", 1],
+        ["Beta", "", "noun", "Test", "2024-01-01", 1],
+        ["alpha", "second", "noun", "Test", "2024-01-02", 1],
+    ])
+
+    backend.update_scores({"ALPHA": 4})
+
+    assert backend.list_scores() == [("Alpha", 4), ("Beta", 1), ("alpha", 1)]
@@ -0,0 +1,70 @@
+from storage import SQLiteBackend
+from store import VocabStore
+
+
+def row(word, count=1):
+    return [word, f"def of {word}", "noun", "Test", "2024-01-01", count]
+
+
+def make_store(tmp_path):
+    path = str(tmp_path / "vocab.sqlite3")
+    backend = SQLiteBackend(path)
+    backend.append_rows([row("Alpha"), row("Beta")])
+    # Probe rarely, so only the write path can decide what is fresh
+    store = VocabStore(backend, ttl=3600, probe_interval=3600)
+    store.records()
+    return store, SQLiteBackend(path)
+
+
+def words(store):
+    return [r["Word"] for r in store.records()]
+
+
+def test_own_write_does_not_reload(tmp_path):
+    store, _ = make_store(tmp_path)
+    refreshes = []
+    store.add_refresh_hook(lambda: refreshes.append(1))
+
+    store.write_counts({"Alpha": 3})
+
+    assert store.count("Alpha") == 3
+    assert refreshes == []
+
+
+def test_outside_edit_before_own_write_is_not_hidden(tmp_path):
+    store, outside = make_store(tmp_path)
+    outside.append_rows([row("Gamma")])
+
+    store.write_counts({"Alpha": 3})
+
+    assert words(store) == ["Alpha", "Beta", "Gamma"]
+    assert store.count("Alpha") == 3
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+def test_outside_add_is_seen_by_every_read_on_later_reruns(tmp_path, monkeypatch):
+    import store as store_module
+
+    clock = FakeClock()
+    monkeypatch.setattr(store_module.time, "time", clock.time)
+    path = str(tmp_path / "vocab.sqlite3")
+    backend = SQLiteBackend(path)
+    backend.append_rows([row("Alpha")])
+    store = VocabStore(backend, ttl=1800, probe_interval=15)
+    store.records()
+
+    SQLiteBackend(path).append_rows([row("Gamma", 4)])
+    for _ in range(2):
+        # One rerun: the sidebar reads the tail first, then the page
+        clock.now += 20
+        assert [r["Word"] for r in store.tail(10)] == ["Alpha", "Gamma"]
+        assert store.contains("Gamma")
+        assert store.count("Gamma") == 4
+        assert [r["Word"] for r in store.practice_batch(1)] == ["Alpha"]